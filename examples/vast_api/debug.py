@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Debug runner for the vast_api WebUI Create tab.
+
+One entry point for the Create tab debug modes, which share server setup,
+page readiness, the Create tab click and teardown:
+
+- ``create``: snapshot buttons, the workflow-tile and the page body, then
+  keep the browser open for manual inspection
+- ``create-auto``: print a one-shot workflow-tile report and exit
+- ``monitor``: wait for workflows to appear in the create-workflows-grid
+
+Usage:
+    python3 examples/vast_api/debug.py --mode monitor --wait 60
+"""
+
+import sys
+import time
+from urllib.parse import urlsplit
+
+from debug_common import VAST_DEBUG_LIB, BrowserClient, get_or_start_server, wait_for_page_ready
+
+DEFAULT_URL = "http://10.0.78.66:5000/"
+
+# Tried in order by the server; the first match is clicked
+CREATE_TAB_SELECTORS = [
+    "button:has-text('🎨 Create')",
+    "button.tab-button:has-text('Create')",
+    ".tab-button[onclick*='create']",
+    "button:has-text('Create')",
+    "[role='tab']:has-text('Create')",
+    ".nav-link:has-text('Create')",
+    "a:has-text('Create')",
+]
+
+AUTO_INSPECT_JS = """
+() => {
+    // Get the Create tab content
+    const createTab = document.querySelector('#create-tab');
+    if (!createTab) {
+        return {found: false, message: 'Create tab not found'};
+    }
+
+    // Find workflow-tile within Create tab
+    const tile = createTab.querySelector('.workflow-tile');
+    if (!tile) {
+        return {found: false, message: 'workflow-tile not found in Create tab'};
+    }
+
+    // Get all buttons in the tile
+    const buttons = tile.querySelectorAll('button');
+    const buttonInfo = new Array(buttons.length);
+    for (let i = 0; i < buttons.length; i++) {
+        const btn = buttons[i];
+        buttonInfo[i] = {
+            text: btn.textContent.trim(),
+            classes: btn.className,
+            id: btn.id || 'none',
+            onclick: btn.getAttribute('onclick') || 'none',
+            disabled: btn.disabled
+        };
+    }
+
+    const childTags = new Array(tile.children.length);
+    for (let i = 0; i < tile.children.length; i++) {
+        childTags[i] = tile.children[i].tagName;
+    }
+
+    // Check for empty state
+    const emptyState = tile.querySelector('.create-empty-state');
+    const emptyIcon = tile.querySelector('.create-empty-state-icon');
+    const emptyDesc = tile.querySelector('.create-empty-state-description');
+
+    // Check for workflow grid
+    const workflowGrid = tile.querySelector('#create-workflows-grid, .workflow-grid');
+    const workflowCards = tile.querySelectorAll('.workflow-card');
+
+    return {
+        found: true,
+        tileHeader: tile.querySelector('.tile-header')?.textContent.trim(),
+        hasEmptyState: !!emptyState,
+        emptyIcon: emptyIcon?.textContent.trim(),
+        emptyDescription: emptyDesc?.textContent.trim(),
+        hasWorkflowGrid: !!workflowGrid,
+        workflowGridId: workflowGrid?.id,
+        workflowCardCount: workflowCards.length,
+        buttonCount: buttons.length,
+        buttons: buttonInfo,
+        childCount: tile.children.length,
+        childTags: childTags,
+        textContent: tile.textContent.trim().slice(0, 500),
+        innerHTML: tile.innerHTML.slice(0, 1500)
+    };
+}
+"""
+
+GRID_CHECK_JS = """
+() => {
+    const grid = document.querySelector('#create-workflows-grid');
+    if (!grid) {
+        return {found: false, message: 'Grid not found'};
+    }
+
+    const emptyState = grid.querySelector('.create-empty-state');
+    const workflows = grid.querySelectorAll('.workflow-card, [class*="workflow"]');
+
+    const preview = new Array(Math.min(workflows.length, 5));
+    for (let i = 0; i < preview.length; i++) {
+        const w = workflows[i];
+        preview[i] = {
+            tag: w.tagName,
+            classes: w.className,
+            // Only trim the 100-char prefix, not the whole text node
+            text: (w.textContent || '').trimStart().substring(0, 100).trimEnd()
+        };
+    }
+
+    const childTags = new Array(grid.children.length);
+    for (let i = 0; i < grid.children.length; i++) {
+        childTags[i] = grid.children[i].tagName;
+    }
+
+    return {
+        found: true,
+        hasEmptyState: !!emptyState,
+        emptyMessage: emptyState ? emptyState.textContent.trim() : null,
+        workflowCount: workflows.length,
+        workflows: preview,
+        innerHTML: grid.innerHTML.slice(0, 500),
+        childCount: grid.children.length,
+        childTags: childTags
+    };
+}
+"""
+
+
+def _click_create_tab(client: BrowserClient, timeout: int = 5000) -> bool:
+    """Click the Create tab with the first matching selector."""
+    result = client.click_first_of(CREATE_TAB_SELECTORS, timeout=timeout)
+    if result.get("status") == "success":
+        print(f"✅ Clicked Create tab using: {result['selector']}\n")
+        return True
+    print(f"⚠️  Could not click Create tab: {result.get('message')}\n")
+    return False
+
+
+def inspect_create_tab(client: BrowserClient):
+    """Snapshot the Create tab workflow-tile and save the page body HTML."""
+    print("📍 Step 1: Click '🎨 Create' tab...")
+    clicked = _click_create_tab(client, timeout=2000)
+
+    # Step 2: Snapshot buttons, workflow-tile and full page in one round-trip
+    print("📍 Step 2: Snapshot page state...")
+
+    # Install the debug helpers once; each call then sends only a
+    # short dispatch expression
+    client.install_library("__vastDebug", VAST_DEBUG_LIB)
+    result = client.eval_js_batch({
+        "buttons": "() => __vastDebug.listButtons()",
+        "tile": "() => __vastDebug.inspectTile()",
+        "similar": "() => __vastDebug.searchSimilar()",
+        "fullPage": "() => __vastDebug.fullPage()",
+    })
+    # A helper that throws (or a missing CompressionStream in fullPage)
+    # fails the whole batch; report it rather than inspect an empty snapshot
+    if result.get('status') != 'success':
+        print(f"❌ Snapshot failed: {result.get('message', 'Unknown error')}\n")
+        return
+    snapshot = result.get('result') or {}
+    page_data = snapshot.get('fullPage', {})
+    print("✅ Snapshot taken\n")
+
+    if not clicked:
+        print("   Inspecting page structure...\n")
+
+        buttons = snapshot.get('buttons', [])
+        print(f"\n   Found {len(buttons)} clickable elements:")
+        for btn in buttons[:10]:
+            print(f"     - {btn['tag']}: '{btn['text']}' (id={btn['id']}, class={btn['classes']})")
+
+    # Step 3: Inspect workflow-tile element IN CREATE TAB
+    print("\n📍 Step 3: Inspect workflow-tile element in Create tab...")
+
+    tile_data = snapshot.get('tile', {})
+
+    if tile_data.get('found'):
+        print("✅ Found workflow-tile element!\n")
+        print(f"   ID: {tile_data.get('id', 'none')}")
+        print(f"   Classes: {tile_data.get('classes', 'none')}")
+        print(f"   Children: {tile_data.get('children', 0)} elements")
+        print(f"   Child tags: {tile_data.get('childrenTags', [])}")
+
+        # Tab information
+        print(f"\n   📑 Buttons in workflow-tile:")
+        print(f"   Found {tile_data.get('tabCount', 0)} buttons")
+        for i, tab in enumerate(tile_data.get('tabs', []), 1):
+            print(f"     Button {i}: '{tab['text']}'")
+            print(f"       Classes: {tab['classes']}")
+            print(f"       ID: {tab['id'] or 'none'}")
+            print(f"       OnClick property: {tab['onclick']}")
+            print(f"       OnClick attribute: {tab['onclickAttr']}")
+
+        # Loading status
+        if tile_data.get('hasLoadingMessage'):
+            print(f"\n   ⏳ Loading message: {tile_data.get('loadingText')}")
+
+        # Workflow list
+        if tile_data.get('hasWorkflowList'):
+            print(f"\n   📋 Workflow list: {tile_data.get('workflowListItems')} items")
+
+        print(f"\n   Text content preview:")
+        print(f"   {tile_data.get('textContent', '')}\n")
+        print(f"   HTML preview (first 1000 chars):")
+        print(f"   {tile_data.get('innerHTML', '')}\n")
+    else:
+        print("⚠️  workflow-tile element not found")
+        print(f"   {tile_data.get('message', 'Unknown error')}\n")
+
+        # Search for similar elements
+        print("   Searching for similar elements...")
+        similar = snapshot.get('similar', [])
+
+        if similar:
+            print(f"   Found {len(similar)} similar elements:")
+            for item in similar:
+                print(f"     - {item['selector']}: {item['count']} element(s)")
+                print(f"       First: id={item['firstId']}, class={item['firstClasses']}")
+        else:
+            print("   No similar elements found")
+
+    # Step 4: Save page body HTML for debugging
+    print("\n📍 Step 4: Save page body HTML...")
+
+    if page_data:
+        import base64
+        import gzip
+
+        # Save body HTML to file (already UTF-8 once decompressed)
+        output_file = "/tmp/vast_api_page.html"
+        with open(output_file, 'wb') as f:
+            f.write(gzip.decompress(base64.b64decode(page_data['gz'])))
+
+        print(f"✅ Page body HTML saved to: {output_file}")
+        print(f"   Body size: {page_data['size']} characters (whitespace collapsed)")
+        print(f"   Title: {page_data['title']}")
+        print(f"   URL: {page_data['url']}")
+
+        # Body text is truncated to 2000 chars in the page
+        print(f"\n   📄 Body text preview (first 2000 chars):")
+        print(f"   {page_data['bodyText']}\n")
+    else:
+        print("⚠️  Failed to extract page data\n")
+
+
+def inspect_create_tab_auto(client: BrowserClient):
+    """Print a one-shot report of the Create tab workflow-tile."""
+    try:
+        print("📍 Clicking Create tab...")
+        if not _click_create_tab(client):
+            return
+        time.sleep(1)
+
+        # Inspect the workflow-tile in Create tab
+        print("📍 Inspecting Create tab workflow-tile...\n")
+
+        result = client.eval_js(AUTO_INSPECT_JS)
+        data = result.get('result', {})
+
+        if not data.get('found'):
+            print(f"⚠️  {data.get('message', 'Unknown error')}\n")
+            return
+
+        # Build the report and emit it with a single write
+        lines = [
+            "=" * 70,
+            "CREATE TAB WORKFLOW-TILE CONTENT",
+            "=" * 70,
+            "",
+            "📋 Basic Info:",
+            f"   Header: {data.get('tileHeader')}",
+            f"   Children: {data.get('childCount')} elements ({data.get('childTags')})",
+            "",
+            "📭 Empty State:",
+            f"   Has empty state: {data.get('hasEmptyState')}",
+        ]
+        if data.get('hasEmptyState'):
+            lines.append(f"   Icon: {data.get('emptyIcon')}")
+            lines.append(f"   Message: {data.get('emptyDescription')}")
+
+        lines += [
+            "",
+            "🗂️  Workflow Grid:",
+            f"   Has workflow grid: {data.get('hasWorkflowGrid')}",
+            f"   Grid ID: {data.get('workflowGridId')}",
+            f"   Workflow cards: {data.get('workflowCardCount')}",
+            "",
+            "🔘 Buttons:",
+            f"   Found {data.get('buttonCount')} buttons",
+        ]
+        for i, btn in enumerate(data.get('buttons', []), 1):
+            lines += [
+                f"   Button {i}:",
+                f"      Text: '{btn['text']}'",
+                f"      ID: {btn['id']}",
+                f"      Classes: {btn['classes']}",
+                f"      OnClick: {btn['onclick']}",
+                f"      Disabled: {btn['disabled']}",
+            ]
+
+        lines += [
+            "",
+            "📄 Text Content (first 500 chars):",
+            f"   {data.get('textContent')}",
+            "",
+            "🔍 HTML Preview (first 1500 chars):",
+            f"   {data.get('innerHTML')}",
+            "",
+            "=" * 70,
+            "END OF REPORT",
+            "=" * 70,
+            "",
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
+
+        print("✅ Debug complete! Check the report above.\n")
+
+    except Exception as e:
+        print(f"❌ Error: {e}\n")
+        import traceback
+        traceback.print_exc()
+
+
+def monitor_grid(client: BrowserClient, wait_seconds: int = 30):
+    """Wait for workflows to appear in the create-workflows-grid."""
+    print("📍 Clicking Create tab...")
+    if not _click_create_tab(client):
+        return
+
+    print("📍 Monitoring create-workflows-grid...")
+    print(f"   Waiting up to {wait_seconds} seconds for workflows...\n")
+
+    # Resolve from a MutationObserver as soon as workflow cards exist,
+    # rather than polling from Python on a fixed interval. Mutations
+    # elsewhere on the page leave the grid's hash unchanged and skip the
+    # full check (FNV-1a, since crypto.subtle needs a secure context).
+    wait_js = f"""
+    () => new Promise(resolve => {{
+        const check = {GRID_CHECK_JS};
+        const gridHash = () => {{
+            const grid = document.querySelector('#create-workflows-grid');
+            if (!grid) return null;
+            const html = grid.innerHTML;
+            let h = 0x811c9dc5;
+            for (let i = 0; i < html.length; i++) {{
+                h = Math.imul(h ^ html.charCodeAt(i), 0x01000193);
+            }}
+            return h >>> 0;
+        }};
+        let lastHash = gridHash();
+        const initial = check();
+        if (initial.found && initial.workflowCount > 0) {{
+            resolve(initial);
+            return;
+        }}
+        const observer = new MutationObserver(() => {{
+            const hash = gridHash();
+            if (hash === lastHash) return;
+            lastHash = hash;
+            const data = check();
+            if (data.found && data.workflowCount > 0) {{
+                observer.disconnect();
+                resolve(data);
+            }}
+        }});
+        observer.observe(document.body, {{childList: true, subtree: true}});
+        setTimeout(() => observer.disconnect(), {wait_seconds * 1000});
+    }})
+    """
+
+    start_time = time.time()
+    result = client.wait_for_js(wait_js, timeout=wait_seconds * 1000)
+    data = result.get('result')
+
+    if data:
+        elapsed = time.time() - start_time
+        print(f"   ✅ Workflows appeared! (t={elapsed:.1f}s)")
+        print(f"      Found {data.get('workflowCount')} workflows:")
+        for i, wf in enumerate(data.get('workflows', []), 1):
+            print(f"         {i}. {wf['tag']} - {wf['text'][:50]}")
+        print(f"\n   HTML preview:")
+        print(f"   {data.get('innerHTML')}\n")
+    else:
+        print(f"\n   ⏱️  Timeout after {wait_seconds} seconds")
+        print("   Workflows did not appear automatically\n")
+
+        # Final check of page structure
+        print("   Final page inspection:")
+        final_result = client.eval_js(GRID_CHECK_JS)
+        final_data = final_result.get('result', {})
+        if not final_data.get('found'):
+            print(f"      {final_data.get('message')}\n")
+        else:
+            print(f"      Empty state: {final_data.get('hasEmptyState')}")
+            if final_data.get('hasEmptyState'):
+                print(f"      Message: {final_data.get('emptyMessage')}")
+            print(f"      Children: {final_data.get('childCount')} ({final_data.get('childTags')})")
+            print(f"      innerHTML: {final_data.get('innerHTML')}\n")
+
+
+MODES = {
+    "create": inspect_create_tab,
+    "create-auto": inspect_create_tab_auto,
+    "monitor": monitor_grid,
+}
+
+# Modes that leave the browser open for manual inspection when done
+_KEEP_OPEN = {"create", "monitor"}
+
+
+def run(mode: str, url: str = DEFAULT_URL, port: int = 9999, **kwargs):
+    """
+    Run one debug mode against the vast_api WebUI.
+
+    Args:
+        mode: One of ``MODES`` ('create', 'create-auto', 'monitor')
+        url: URL of the vast_api WebUI
+        port: Port for browser server
+        **kwargs: Passed to the mode, e.g. ``wait_seconds`` for 'monitor'
+    """
+    handler = MODES[mode]
+
+    print(f"🔍 vast_api WebUI Debugger ({mode})")
+    print(f"   WebUI: {url}")
+    print(f"   Server Port: {port}\n")
+
+    # Reuse a running browser server, or start one in a background thread
+    print("⏳ Looking for browser server...")
+    server, server_exists = get_or_start_server(port, url)
+    if server_exists:
+        print(f"✓ Found existing browser server on port {port}\n")
+    else:
+        print("✓ Server started\n")
+
+    with BrowserClient(port=port) as client:
+        try:
+            # Wait for the WebUI (past any login redirect) instead of an auth prompt
+            if not wait_for_page_ready(client, urlsplit(url).hostname or url):
+                print(f"⚠️  Page did not reach {url}, continuing anyway\n")
+
+            info = client.info()
+            print(f"📍 Current page:")
+            print(f"   URL: {info.get('url')}")
+            print(f"   Title: {info.get('title')}\n")
+
+            handler(client, **kwargs)
+
+            if mode in _KEEP_OPEN:
+                import threading
+
+                print("🔍 Browser remains open for manual inspection")
+                print("   Press Ctrl+C to exit\n")
+
+                try:
+                    # Block without periodic wakeups until Ctrl+C
+                    threading.Event().wait()
+                except KeyboardInterrupt:
+                    print("\n✅ Exiting...")
+
+        finally:
+            # Only quit if we started the server
+            if server:
+                print("🛑 Stopping browser server...")
+                client.send_command({"action": "quit"})
+                time.sleep(1)
+
+
+def main(argv=None):
+    """Parse command-line arguments and run the selected mode."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Debug vast_api WebUI Create tab")
+    parser.add_argument(
+        "--mode",
+        choices=sorted(MODES),
+        default="create",
+        help="Debug mode (default: create)"
+    )
+    parser.add_argument(
+        "--url",
+        default=DEFAULT_URL,
+        help=f"WebUI URL (default: {DEFAULT_URL})"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=9999,
+        help="Browser server port (default: 9999)"
+    )
+    parser.add_argument(
+        "--wait",
+        type=int,
+        default=30,
+        help="Seconds to wait for workflows in monitor mode (default: 30)"
+    )
+
+    args = parser.parse_args(argv)
+
+    kwargs = {"wait_seconds": args.wait} if args.mode == "monitor" else {}
+    run(args.mode, url=args.url, port=args.port, **kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Shared helpers for the vast_api WebUI debug scripts.
+
+The scripts are run directly (``python3 examples/vast_api/<script>.py``), so
+they import this module as a sibling rather than through the package. It also
+puts ``src`` on ``sys.path`` and re-exports the browser server and client.
+"""
+from __future__ import annotations
+
+import json
+import socket
+import sys
+import time
+from pathlib import Path
+
+# Add src to path once for every script that imports this module
+_SRC_DIR = str(Path(__file__).resolve().parent.parent.parent / "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+from browser_agent.server.browser_server import BrowserServer
+from browser_agent.server.browser_client import BrowserClient
+
+__all__ = [
+    "BrowserServer",
+    "BrowserClient",
+    "VAST_DEBUG_LIB",
+    "is_port_in_use",
+    "get_or_start_server",
+    "wait_for_port",
+    "wait_for_page_ready",
+]
+
+
+# Page-side helpers installed once with client.install_library("__vastDebug", ...)
+# and then invoked as e.g. "() => __vastDebug.inspectTile()".
+VAST_DEBUG_LIB = """
+window.__vastDebug = {
+    listButtons() {
+        const buttons = document.querySelectorAll('button, [role="tab"], .nav-link');
+        const out = new Array(buttons.length);
+        for (let i = 0; i < buttons.length; i++) {
+            const btn = buttons[i];
+            out[i] = {
+                tag: btn.tagName,
+                // Only trim the 50-char prefix, not the whole text node
+                text: (btn.textContent || '').trimStart().substring(0, 50).trimEnd(),
+                id: btn.id,
+                classes: btn.className
+            };
+        }
+        return out;
+    },
+
+    inspectTile() {
+        // Get the Create tab content first
+        const createTab = document.querySelector('#create-tab');
+        if (!createTab) {
+            return {found: false, message: 'Create tab not found'};
+        }
+
+        // Find workflow-tile within Create tab
+        const tile = createTab.querySelector('.workflow-tile');
+        if (!tile) {
+            return {found: false, message: 'workflow-tile not found in Create tab'};
+        }
+
+        // Get all buttons inside the tile
+        const tabs = tile.querySelectorAll('button');
+        const tabInfo = new Array(tabs.length);
+        for (let i = 0; i < tabs.length; i++) {
+            const tab = tabs[i];
+            tabInfo[i] = {
+                text: tab.textContent.trim(),
+                classes: tab.className,
+                id: tab.id,
+                onclick: tab.onclick ? 'has onclick' : 'no onclick',
+                onclickAttr: tab.getAttribute('onclick') || 'none'
+            };
+        }
+
+        const childrenTags = new Array(tile.children.length);
+        for (let i = 0; i < tile.children.length; i++) {
+            childrenTags[i] = tile.children[i].tagName;
+        }
+
+        // Get workflow loading status
+        const loadingMsg = tile.querySelector('.loading-message, [class*="loading"]');
+        const workflowList = tile.querySelector('.workflow-list, [class*="workflow-list"]');
+
+        return {
+            found: true,
+            innerHTML: tile.innerHTML.slice(0, 1000),
+            textContent: tile.textContent.trim().slice(0, 300),
+            classes: tile.className,
+            id: tile.id,
+            children: tile.children.length,
+            childrenTags: childrenTags,
+            tabs: tabInfo,
+            tabCount: tabs.length,
+            hasLoadingMessage: !!loadingMsg,
+            loadingText: loadingMsg ? loadingMsg.textContent.trim() : null,
+            hasWorkflowList: !!workflowList,
+            workflowListItems: workflowList ? workflowList.children.length : 0
+        };
+    },
+
+    searchSimilar() {
+        const selectors = [
+            '.workflow', '.tile', '[class*="workflow"]', 
+            '[class*="tile"]', '#workflow', '#tile'
+        ];
+
+        const found = [];
+        for (const sel of selectors) {
+            const elements = document.querySelectorAll(sel);
+            if (elements.length > 0) {
+                found.push({
+                    selector: sel,
+                    count: elements.length,
+                    firstClasses: elements[0].className,
+                    firstId: elements[0].id
+                });
+            }
+        }
+        return found;
+    },
+
+    async fullPage() {
+        // <body> only (the <head> is mostly inlined styles), with whitespace
+        // runs collapsed
+        const html = document.body.outerHTML.replace(/\s+/g, ' ');
+        const stream = new Blob([html]).stream().pipeThrough(new CompressionStream('gzip'));
+        const bytes = new Uint8Array(await new Response(stream).arrayBuffer());
+        let binary = '';
+        for (let i = 0; i < bytes.length; i += 0x8000) {
+            binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+        }
+        return {
+            gz: btoa(binary),
+            size: html.length,
+            bodyText: document.body.textContent.trim().slice(0, 2000),
+            title: document.title,
+            url: window.location.href
+        };
+    }
+};
+"""
+
+
+def is_port_in_use(port: int) -> bool:
+    """
+    Check if a port is already in use by trying to bind to it.
+
+    Binding fails immediately with EADDRINUSE when a server is listening, so
+    this avoids a TCP handshake per probe. SO_REUSEADDR keeps lingering
+    TIME_WAIT sockets from a previous server from reading as "in use".
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        if sys.platform == "win32":
+            import select
+
+            # SO_REUSEADDR lets Windows bind over a live listener; connect
+            # instead, without blocking on a dropped port
+            s.setblocking(False)
+            if s.connect_ex(('127.0.0.1', port)) == 0:
+                return True
+            _, writable, _ = select.select([], [s], [], 0.05)
+            return bool(writable) and s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            s.bind(('localhost', port))
+            return False
+        except OSError:
+            return True
+
+
+def wait_for_port(port: int, timeout: float = 5.0, interval: float = 0.01) -> bool:
+    """
+    Wait until a browser server on ``port`` is bound and answering pings.
+
+    Polls the cheap bind probe until the port is taken, then pings so the
+    caller does not race the window between bind() and listen().
+
+    Returns:
+        True once the server answers, False if ``timeout`` seconds pass.
+    """
+    deadline = time.monotonic() + timeout
+    client = BrowserClient(port=port)
+    while time.monotonic() < deadline:
+        if is_port_in_use(port) and client.ping().get("status") == "success":
+            return True
+        time.sleep(interval)
+    return False
+
+
+def get_or_start_server(
+    port: int,
+    webui_url: str,
+    headless: bool = False,
+    wait_for_auth: bool = False,
+    timeout: float = 10.0,
+) -> tuple[BrowserServer | None, bool]:
+    """
+    Reuse a browser server already listening on ``port`` or start a new one.
+
+    A new server runs in a daemon thread; this returns once it answers on
+    its port (see ``wait_for_port``) rather than after a fixed delay.
+
+    Args:
+        port: Browser server port
+        webui_url: URL the new server navigates to on startup
+        headless: Run a newly started browser headless
+        wait_for_auth: Hold a newly started server until a 'ready' command
+        timeout: Seconds to wait for a new server to come up
+
+    Returns:
+        ``(server, reused)`` - ``server`` is None when an existing server
+        was reused, so callers know not to shut it down.
+
+    Raises:
+        RuntimeError: If a new server does not come up within ``timeout``.
+    """
+    if is_port_in_use(port):
+        return None, True
+
+    import threading
+
+    server = BrowserServer(port=port, headless=headless)
+    server_thread = threading.Thread(
+        target=server.start,
+        kwargs={"initial_url": webui_url, "wait_for_auth": wait_for_auth},
+        daemon=True,
+    )
+    server_thread.start()
+
+    if not wait_for_port(port, timeout=timeout):
+        raise RuntimeError(f"Browser server did not come up on port {port}")
+
+    return server, False
+
+
+# Resolves once location.href contains the fragment, re-checking on in-page
+# navigation events and DOM mutations (SPA routers) rather than on a timer.
+_URL_READY_JS = """
+() => new Promise(resolve => {
+    const fragment = %s;
+    const check = () => {
+        if (document.readyState !== 'loading' && location.href.includes(fragment)) {
+            observer.disconnect();
+            window.removeEventListener('hashchange', check);
+            window.removeEventListener('popstate', check);
+            resolve(location.href);
+        }
+    };
+    const observer = new MutationObserver(check);
+    observer.observe(document, {childList: true, subtree: true});
+    window.addEventListener('hashchange', check);
+    window.addEventListener('popstate', check);
+    check();
+})
+"""
+
+
+def wait_for_page_ready(client: BrowserClient, expected_url_fragment: str, timeout: float = 30) -> bool:
+    """
+    Wait until the page URL contains ``expected_url_fragment``.
+
+    Replaces the interactive ``wait_for_auth`` pause: once login (or any
+    redirect) lands on the expected URL the script carries on by itself.
+    A full navigation destroys the page's JS context and fails the pending
+    evaluation, so the wait is re-armed until ``timeout`` seconds pass.
+
+    Returns:
+        True if the URL matched in time, False otherwise.
+    """
+    script = _URL_READY_JS % json.dumps(expected_url_fragment)
+    deadline = time.monotonic() + timeout
+    while (remaining := deadline - time.monotonic()) > 0:
+        result = client.wait_for_js(script, timeout=int(remaining * 1000))
+        if result.get("status") == "success":
+            return result.get("result") is not None
+        time.sleep(0.05)  # Navigation in progress; re-arm on the new document
+    return False
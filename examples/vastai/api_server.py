@@ -9,39 +9,141 @@ Provides REST API endpoints for:
 
 This allows credentials to be provided via API requests instead of files.
 """
+import argparse
+import asyncio
+from contextlib import asynccontextmanager
+import json
 from pathlib import Path
 import sys
+import threading
+import time
 from typing import Optional
 
-# Add src to path for imports
+# Add src to path for imports unless it is already there
 project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "src"))
+_SRC_DIR = str(project_root / "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from pydantic import BaseModel, Field
+from fastapi import Depends, FastAPI, HTTPException, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, ConfigDict, Field
 from browser_agent.server.browser_server import BrowserServer
 from browser_agent.server.browser_client import BrowserClient
 from browser_agent.browser.actions import Navigate
 import uvicorn
 
 # Import workflow functions
-from open_workflow import open_workflow
+from credentials import build_auth_url, redact_auth_url
+from open_workflow import WORKFLOW_BUTTON_SELECTOR, open_workflow
 from queue_workflow import queue_workflow
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Own the browser session registry on app.state for the app's lifetime.
+    
+    On shutdown, closes the shared client connection and stops an active
+    browser server so it is not killed mid-command with the process.
+    """
+    # The active session; start/stop hold session_lock while changing it so
+    # concurrent requests cannot start two browser servers
+    app.state.session_lock = asyncio.Lock()
+    app.state.server = None
+    app.state.server_thread = None
+    app.state.client = None
+    app.state.last_ping_ok = 0.0
+    try:
+        yield
+    finally:
+        async with app.state.session_lock:
+            if app.state.client:
+                app.state.client.close()
+            if app.state.server:
+                # The server loop stops the browser from its own thread
+                app.state.server.stop()
+                await asyncio.to_thread(app.state.server_thread.join, 5.0)
+
+
+# Responses use FastAPI's default response class: with a response model set,
+# FastAPI (>= 0.130) serializes straight to JSON bytes in pydantic-core. A
+# custom default_response_class (e.g. ORJSONResponse) would opt out of that.
+# Returned model instances are not re-validated (pydantic v2 passes instances
+# of the declared model through), so keep response_model on the endpoints.
 app = FastAPI(
     title="VastAI ComfyUI Automation API",
     description="REST API for automating ComfyUI workflows on vast.ai instances",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
-# Global browser server instance
-browser_server: Optional[BrowserServer] = None
-browser_client: Optional[BrowserClient] = None
+# Compress larger JSON bodies (e.g. responses with details); level 5 keeps
+# most of the size win at a fraction of level 9's CPU on the event loop
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
+
+async def _wait_ready(server: BrowserServer, thread: threading.Thread, timeout: float = 30.0) -> bool:
+    """
+    Wait until the browser server accepts commands.
+    
+    Awaits the server's ``ready`` event, which is set once the browser is up
+    and the initial page has loaded, in a worker thread so the event loop
+    stays free. Gives up early if the server thread exits (e.g. the browser
+    failed to launch).
+    
+    Returns:
+        True once the server is ready, False otherwise.
+    """
+    deadline = time.monotonic() + timeout
+    while not server.ready.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not thread.is_alive():
+            return False
+        await asyncio.to_thread(server.ready.wait, min(remaining, 0.25))
+    return True
+
+
+# Strip request strings and reject unknown fields during validation, in
+# pydantic-core, rather than in the handlers
+_MODEL_CONFIG = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+
+# Seconds a successful ping vouches for the session, so back-to-back
+# workflow calls don't each pay for a liveness round-trip
+_PING_TTL = 0.5
+
+
+async def require_live_client() -> BrowserClient:
+    """
+    Dependency returning the session's client once it is known to respond.
+    
+    Raises:
+        HTTPException: 400 without an active session, 503 if the browser
+            server does not answer a ping.
+    """
+    state = app.state
+    browser_client = state.client
+    if not browser_client:
+        raise HTTPException(
+            status_code=400,
+            detail="No active browser session. Start a session first with POST /session/start"
+        )
+    
+    if time.monotonic() - state.last_ping_ok >= _PING_TTL:
+        # Browser calls run in a worker thread so they don't block the event loop
+        ping_result = await asyncio.to_thread(browser_client.ping)
+        if ping_result.get("status") != "success":
+            raise HTTPException(status_code=503, detail="Browser server not responding")
+        state.last_ping_ok = time.monotonic()
+    
+    return browser_client
 
 
 class Credentials(BaseModel):
     """Authentication credentials for vast.ai instance."""
+    model_config = _MODEL_CONFIG
+    
     username: Optional[str] = Field(None, description="HTTP basic auth username (optional for localhost)")
     password: Optional[str] = Field(None, description="HTTP basic auth password (optional for localhost)")
     url: str = Field(..., description="ComfyUI instance URL (e.g., https://example.trycloudflare.com or http://localhost:8188)")
@@ -50,6 +152,8 @@ class Credentials(BaseModel):
 
 class StartSessionRequest(BaseModel):
     """Request to start an authenticated browser session."""
+    model_config = _MODEL_CONFIG
+    
     credentials: Credentials
     port: int = Field(9999, description="Port for browser server")
     headless: bool = Field(True, description="Run browser in headless mode")
@@ -58,18 +162,24 @@ class StartSessionRequest(BaseModel):
 
 class OpenWorkflowRequest(BaseModel):
     """Request to open a workflow."""
+    model_config = _MODEL_CONFIG
+    
     workflow_path: str = Field(..., description="Path to workflow file in ComfyUI (e.g., 'workflows/my_workflow.json')")
     port: int = Field(9999, description="Browser server port to connect to")
 
 
 class QueueWorkflowRequest(BaseModel):
     """Request to queue workflow executions."""
+    model_config = _MODEL_CONFIG
+    
     iterations: int = Field(1, ge=1, le=100, description="Number of times to execute the workflow")
     port: int = Field(9999, description="Browser server port to connect to")
 
 
 class SessionStatus(BaseModel):
     """Status of the browser session."""
+    model_config = _MODEL_CONFIG
+    
     active: bool
     port: Optional[int] = None
     url: Optional[str] = None
@@ -77,65 +187,71 @@ class SessionStatus(BaseModel):
 
 class OperationResponse(BaseModel):
     """Response for workflow operations."""
+    model_config = _MODEL_CONFIG
+    
     success: bool
     message: str
     details: Optional[dict] = None
 
 
-@app.get("/", response_model=dict)
+# The root listing never changes, so it is serialized once at import
+_ROOT_BYTES = json.dumps({
+    "name": "VastAI ComfyUI Automation API",
+    "version": "1.0.0",
+    "endpoints": {
+        "POST /session/start": "Start authenticated browser session",
+        "POST /session/stop": "Stop browser session",
+        "GET /session/status": "Get session status",
+        "POST /workflow/open": "Open a workflow",
+        "POST /workflow/queue": "Queue workflow executions"
+    }
+}).encode()
+
+
+@app.get("/")
 async def root():
     """API root endpoint."""
-    return {
-        "name": "VastAI ComfyUI Automation API",
-        "version": "1.0.0",
-        "endpoints": {
-            "POST /session/start": "Start authenticated browser session",
-            "POST /session/stop": "Stop browser session",
-            "GET /session/status": "Get session status",
-            "POST /workflow/open": "Open a workflow",
-            "POST /workflow/queue": "Queue workflow executions"
-        }
-    }
+    return Response(_ROOT_BYTES, media_type="application/json")
 
 
 @app.post("/session/start", response_model=OperationResponse)
-async def start_session(request: StartSessionRequest, background_tasks: BackgroundTasks):
+async def start_session(request: StartSessionRequest):
     """
     Start an authenticated browser session.
     
     This creates a persistent browser instance and navigates to the ComfyUI instance
     with HTTP basic authentication.
     """
-    global browser_server, browser_client
-    
+    state = app.state
+    async with state.session_lock:
+        return await _start_session(state, request)
+
+
+async def _start_session(state, request: StartSessionRequest) -> OperationResponse:
+    """Start a session; the caller holds ``state.session_lock``."""
     # Check if session already exists
-    if browser_server and browser_server.running:
+    if state.server and state.server.running:
         return OperationResponse(
             success=False,
             message="Browser session already active. Stop the existing session first.",
-            details={"port": browser_server.port}
+            details={"port": state.server.port}
         )
     
+    browser_server = browser_client = server_thread = None
     try:
         # Build URL with optional authentication
-        base_url = request.credentials.url.strip()
+        base_url = request.credentials.url
         
-        # Add authentication only if username and password are provided
-        if request.credentials.username and request.credentials.password:
-            username = request.credentials.username
-            password = request.credentials.password
-            
-            # Remove protocol if present to rebuild with auth
-            if "://" in base_url:
-                protocol, rest = base_url.split("://", 1)
-                auth_url = f"{protocol}://{username}:{password}@{rest}"
-            else:
-                auth_url = f"https://{username}:{password}@{base_url}"
-        else:
-            # No authentication needed (e.g., localhost)
-            auth_url = base_url
-            if not base_url.startswith(("http://", "https://")):
-                auth_url = f"http://{base_url}"
+        # Add authentication only if username and password are provided;
+        # without them (e.g. localhost) a bare host defaults to http
+        username = request.credentials.username
+        password = request.credentials.password
+        auth_url = build_auth_url(
+            base_url,
+            username,
+            password,
+            default_scheme="https" if username and password else "http",
+        )
         
         # Start browser server
         browser_server = BrowserServer(
@@ -144,47 +260,48 @@ async def start_session(request: StartSessionRequest, background_tasks: Backgrou
             log_file=f"/tmp/vastai_browser_{request.port}.log"
         )
         
-        # Start in background since it's a blocking call
-        def start_server():
-            browser_server.start(initial_url=auth_url, wait_for_auth=False)
-        
-        background_tasks.add_task(start_server)
-        
-        # Create client for future operations
-        browser_client = BrowserClient(port=request.port)
-        
-        # Give server a moment to start
-        import time
-        time.sleep(2)
+        # Start in a daemon thread since it's a blocking call; background
+        # tasks would only run after this response has been sent
+        server_thread = threading.Thread(
+            target=browser_server.start,
+            kwargs={"initial_url": auth_url, "wait_for_auth": False},
+            daemon=True,
+        )
+        server_thread.start()
         
-        # Verify server is responding
-        ping_result = browser_client.ping()
-        if ping_result.get("status") != "success":
-            raise Exception("Server started but not responding to ping")
+        # Create one client for all later operations; it keeps a single
+        # connection to the server open instead of reconnecting per call
+        browser_client = BrowserClient(port=request.port, keep_alive=True)
         
-        # Mask credentials in response if they exist
-        display_url = auth_url
-        if request.credentials.username and request.credentials.password:
-            display_url = auth_url.replace(f"{request.credentials.username}:{request.credentials.password}@", "***:***@")
+        # Wait for the server's ready signal instead of sleeping a fixed time
+        if not await _wait_ready(browser_server, server_thread):
+            raise Exception("Browser server did not become ready")
         
         details = {
             "port": request.port,
-            "url": display_url,
+            "url": redact_auth_url(auth_url),  # Mask credentials if they exist
             "headless": request.headless
         }
         
         # Auto-open workflow if provided
         workflow_opened = False
         if request.auto_open_workflow and request.credentials.workflow_path:
-            import time
-            time.sleep(1)  # Extra moment for page to stabilize
+            # Wait for ComfyUI to render its sidebar rather than a fixed delay
+            await asyncio.to_thread(browser_client.wait, WORKFLOW_BUTTON_SELECTOR, 10000)
             try:
-                workflow_opened = open_workflow(browser_client, request.credentials.workflow_path)
+                workflow_opened = await asyncio.to_thread(
+                    open_workflow, browser_client, request.credentials.workflow_path
+                )
                 details["workflow_path"] = request.credentials.workflow_path
                 details["workflow_opened"] = workflow_opened
             except Exception as e:
                 details["workflow_error"] = str(e)
         
+        state.server = browser_server
+        state.server_thread = server_thread
+        state.client = browser_client
+        state.last_ping_ok = time.monotonic()
+        
         message = f"Browser session started on port {request.port}"
         if workflow_opened:
             message += f" and opened workflow: {request.credentials.workflow_path}"
@@ -196,50 +313,63 @@ async def start_session(request: StartSessionRequest, background_tasks: Backgrou
         )
         
     except Exception as e:
-        browser_server = None
-        browser_client = None
+        if browser_client:
+            browser_client.close()
+        # stop() holds even if the server thread is still launching the
+        # browser: it then returns before binding the port, and once
+        # serving its loop exits and closes the browser
+        if browser_server:
+            browser_server.stop()
+        if server_thread:
+            await asyncio.to_thread(server_thread.join, 5.0)
         raise HTTPException(status_code=500, detail=f"Failed to start session: {str(e)}")
 
 
 @app.post("/session/stop", response_model=OperationResponse)
 async def stop_session():
     """Stop the active browser session."""
-    global browser_server, browser_client
-    
-    if not browser_server or not browser_server.running:
-        return OperationResponse(
-            success=False,
-            message="No active browser session to stop"
-        )
-    
-    try:
-        # Stop the server
-        browser_server.running = False
-        if browser_server.controller:
-            browser_server.controller.stop()
-        
-        port = browser_server.port
-        browser_server = None
-        browser_client = None
-        
-        return OperationResponse(
-            success=True,
-            message=f"Browser session on port {port} stopped"
-        )
+    state = app.state
+    async with state.session_lock:
+        browser_server = state.server
+        if not browser_server or not browser_server.running:
+            return OperationResponse(
+                success=False,
+                message="No active browser session to stop"
+            )
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to stop session: {str(e)}")
+        try:
+            # Stop the server; its loop stops the browser from its own thread
+            port = browser_server.port
+            if state.client:
+                state.client.close()
+            browser_server.stop()
+            if state.server_thread:
+                await asyncio.to_thread(state.server_thread.join, 5.0)
+            state.server = None
+            state.server_thread = None
+            state.client = None
+            state.last_ping_ok = 0.0
+            
+            return OperationResponse(
+                success=True,
+                message=f"Browser session on port {port} stopped"
+            )
+            
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to stop session: {str(e)}")
 
 
 @app.get("/session/status", response_model=SessionStatus)
 async def session_status():
     """Get the status of the browser session."""
+    browser_server = app.state.server
+    browser_client = app.state.client
     if browser_server and browser_server.running:
         # Try to get current URL from observation
         url = None
         try:
             if browser_client:
-                info_result = browser_client.info()
+                info_result = await asyncio.to_thread(browser_client.info)
                 if info_result.get("status") == "success":
                     url = info_result.get("url")
         except:
@@ -255,27 +385,19 @@ async def session_status():
 
 
 @app.post("/workflow/open", response_model=OperationResponse)
-async def open_workflow_endpoint(request: OpenWorkflowRequest):
+async def open_workflow_endpoint(
+    request: OpenWorkflowRequest,
+    browser_client: BrowserClient = Depends(require_live_client),
+):
     """
     Open a workflow in ComfyUI.
     
     Navigates the ComfyUI interface to open the specified workflow file.
     Requires an active browser session.
     """
-    if not browser_client:
-        raise HTTPException(
-            status_code=400,
-            detail="No active browser session. Start a session first with POST /session/start"
-        )
-    
     try:
-        # Check if server is responding
-        ping_result = browser_client.ping()
-        if ping_result.get("status") != "success":
-            raise HTTPException(status_code=503, detail="Browser server not responding")
-        
         # Open the workflow
-        success = open_workflow(browser_client, request.workflow_path)
+        success = await asyncio.to_thread(open_workflow, browser_client, request.workflow_path)
         
         if success:
             return OperationResponse(
@@ -294,27 +416,19 @@ async def open_workflow_endpoint(request: OpenWorkflowRequest):
 
 
 @app.post("/workflow/queue", response_model=OperationResponse)
-async def queue_workflow_endpoint(request: QueueWorkflowRequest):
+async def queue_workflow_endpoint(
+    request: QueueWorkflowRequest,
+    browser_client: BrowserClient = Depends(require_live_client),
+):
     """
     Queue workflow executions.
     
     Sets the batch count and clicks the run button to queue executions.
     Requires an active browser session with a workflow already opened.
     """
-    if not browser_client:
-        raise HTTPException(
-            status_code=400,
-            detail="No active browser session. Start a session first with POST /session/start"
-        )
-    
     try:
-        # Check if server is responding
-        ping_result = browser_client.ping()
-        if ping_result.get("status") != "success":
-            raise HTTPException(status_code=503, detail="Browser server not responding")
-        
         # Queue the workflow
-        success = queue_workflow(browser_client, request.iterations)
+        success = await asyncio.to_thread(queue_workflow, browser_client, request.iterations)
         
         if success:
             return OperationResponse(
@@ -335,8 +449,6 @@ async def queue_workflow_endpoint(request: QueueWorkflowRequest):
 
 def main():
     """Run the API server."""
-    import argparse
-    
     parser = argparse.ArgumentParser(
         description="VastAI ComfyUI Automation API Server"
     )
@@ -365,11 +477,16 @@ def main():
     print(f"   Port: {args.port}")
     print(f"   Docs: http://localhost:{args.port}/docs")
     
+    # Ask for uvloop/httptools (from uvicorn[standard]) explicitly so a
+    # missing install fails at startup instead of silently falling back to
+    # the pure-Python parser; uvloop has no Windows build
     uvicorn.run(
         "api_server:app",
         host=args.host,
         port=args.port,
-        reload=args.reload
+        reload=args.reload,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
     )
 
 
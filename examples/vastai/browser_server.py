@@ -8,68 +8,7 @@ from browser_agent.server.browser_server import BrowserServer
 from pathlib import Path
 import sys
 
-
-def load_credentials(credentials_file: Path) -> tuple[str, str, str, str]:
-    """Load credentials, URL, and workflow path from the credentials file.
-    
-    Returns:
-        tuple[str, str, str, str]: username, password, url, workflow_path
-    """
-    if not credentials_file.exists():
-        raise FileNotFoundError(
-            f"Credentials file not found: {credentials_file}\n"
-            "Please create it with format:\n"
-            "  Line 1: username:password\n"
-            "  Line 2: url\n"
-            "  Line 3: workflow_path"
-        )
-    
-    content = credentials_file.read_text().strip()
-    username = None
-    password = None
-    url = None
-    workflow_path = None
-    
-    # Parse the file looking for credentials, URL, and workflow
-    non_comment_lines = []
-    for line in content.split("\n"):
-        line = line.strip()
-        if line and not line.startswith("#"):
-            non_comment_lines.append(line)
-    
-    # First line with colon is username:password
-    if len(non_comment_lines) >= 1 and ":" in non_comment_lines[0]:
-        username, password = non_comment_lines[0].split(":", 1)
-        username = username.strip()
-        password = password.strip()
-    
-    # Second line is URL
-    if len(non_comment_lines) >= 2:
-        url = non_comment_lines[1].strip()
-    
-    # Third line is workflow path (optional)
-    if len(non_comment_lines) >= 3:
-        workflow_path = non_comment_lines[2].strip()
-    
-    if not username or not password:
-        raise ValueError(
-            f"Invalid credentials format in {credentials_file}\n"
-            "Expected format:\n"
-            "  Line 1: username:password\n"
-            "  Line 2: url\n"
-            "  Line 3: workflow_path (optional)"
-        )
-    
-    if not url:
-        raise ValueError(
-            f"URL not found in {credentials_file}\n"
-            "Expected format:\n"
-            "  Line 1: username:password\n"
-            "  Line 2: url\n"
-            "  Line 3: workflow_path (optional)"
-        )
-    
-    return username, password, url, workflow_path
+from credentials import build_auth_url, load_credentials
 
 
 def main():
@@ -118,7 +57,9 @@ def main():
     
     # Load credentials, URL, and workflow
     try:
-        username, password, url, workflow_path = load_credentials(args.credentials_file)
+        credentials = load_credentials(args.credentials_file)
+        username, password = credentials.username, credentials.password
+        url, workflow_path = credentials.url, credentials.workflow_path
         print(f"✅ Loaded credentials for user: {username}")
         print(f"✅ Loaded URL: {url}")
         if workflow_path:
@@ -132,11 +73,7 @@ def main():
     target_workflow = args.workflow if args.workflow else workflow_path
     
     # Build URL with credentials for HTTP basic auth
-    if "://" in target_url:
-        scheme, rest = target_url.split("://", 1)
-        auth_url = f"{scheme}://{username}:{password}@{rest}"
-    else:
-        auth_url = f"https://{username}:{password}@{target_url}"
+    auth_url = build_auth_url(target_url, username, password)
     
     print(f"\n🚀 Starting browser server on port {args.port}")
     print(f"   Target URL: {target_url}")
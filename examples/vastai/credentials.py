@@ -0,0 +1,137 @@
+"""
+Credential helpers shared by the vast.ai example scripts.
+
+Import as a sibling module (``from credentials import build_auth_url``), as
+the scripts in this directory do for ``open_workflow`` and ``queue_workflow``.
+
+The credentials file holds up to three non-comment lines::
+
+    username:password
+    url
+    workflow_path
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import os
+from pathlib import Path
+from urllib.parse import quote, urlsplit, urlunsplit
+
+_FORMAT_HELP = (
+    "Expected format:\n"
+    "  Line 1: username:password\n"
+    "  Line 2: url\n"
+    "  Line 3: workflow_path (optional)"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Credentials:
+    """Contents of a credentials file; missing lines are None."""
+
+    username: str | None = None
+    password: str | None = None
+    url: str | None = None
+    workflow_path: str | None = None
+
+
+# Parsed files keyed by path, invalidated when the file's mtime changes
+_cache: dict[Path, tuple[int, Credentials]] = {}
+
+
+def read_credentials(credentials_file: Path) -> Credentials:
+    """
+    Parse the credentials file without validating it.
+
+    The file is streamed and reading stops at the third non-comment line.
+    Results are cached per path until the file is modified, so callers in a
+    loop do not re-read it.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    credentials_file = Path(credentials_file)
+    # Open first and take the mtime from the open file, so a file removed
+    # or replaced between the check and the read cannot slip through
+    try:
+        f = credentials_file.open(encoding="utf-8")
+    except FileNotFoundError as e:
+        raise FileNotFoundError(
+            f"Credentials file not found: {credentials_file}\n"
+            f"Please create it. {_FORMAT_HELP}"
+        ) from e
+
+    lines = []
+    with f:
+        mtime = os.fstat(f.fileno()).st_mtime_ns
+        cached = _cache.get(credentials_file)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        for raw in f:
+            line = raw.strip()
+            if line and not line.startswith("#"):
+                lines.append(line)
+                if len(lines) == 3:
+                    break
+    lines += [None] * (3 - len(lines))
+
+    username = password = None
+    if lines[0] and ":" in lines[0]:
+        username, _, password = lines[0].partition(":")
+        username = username.strip()
+        password = password.strip()
+
+    credentials = Credentials(username, password, lines[1], lines[2])
+    _cache[credentials_file] = (mtime, credentials)
+    return credentials
+
+
+def load_credentials(credentials_file: Path) -> Credentials:
+    """
+    Parse the credentials file, requiring a username, password and URL.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the credentials or URL line is missing.
+    """
+    credentials = read_credentials(credentials_file)
+    if not credentials.username or not credentials.password:
+        raise ValueError(f"Invalid credentials format in {credentials_file}\n{_FORMAT_HELP}")
+    if not credentials.url:
+        raise ValueError(f"URL not found in {credentials_file}\n{_FORMAT_HELP}")
+    return credentials
+
+
+def build_auth_url(
+    url: str,
+    username: str | None = None,
+    password: str | None = None,
+    default_scheme: str = "https",
+) -> str:
+    """
+    Return ``url`` with HTTP basic auth credentials embedded.
+
+    A URL without a scheme gets ``default_scheme``. The credentials are
+    percent-encoded, so ``@`` or ``:`` in a password cannot break the URL, and
+    any userinfo already in ``url`` is replaced. Without both a username and
+    a password, the URL is only given a scheme.
+    """
+    if "://" not in url:
+        url = f"{default_scheme}://{url}"
+    if not (username and password):
+        return url
+
+    parts = urlsplit(url)
+    host = parts.netloc.rpartition("@")[2]
+    netloc = f"{quote(username, safe='')}:{quote(password, safe='')}@{host}"
+    return urlunsplit(parts._replace(netloc=netloc))
+
+
+def redact_auth_url(url: str) -> str:
+    """Return ``url`` with any embedded credentials replaced by ``***:***``."""
+    parts = urlsplit(url)
+    userinfo, sep, host = parts.netloc.rpartition("@")
+    if not sep:
+        return url
+    return urlunsplit(parts._replace(netloc=f"***:***@{host}"))
@@ -7,153 +7,161 @@ This script sends commands to the browser server to:
 2. Navigate the workflow tree
 3. Open the specified workflow file
 """
+import json
 from pathlib import Path
 import sys
-import time
 
-# Add src to path for imports
+# Add src to path for imports; skipped when api_server, which imports
+# this module, has already added it
 project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "src"))
+_SRC_DIR = str(project_root / "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 from browser_agent.server.browser_client import BrowserClient
 
+from credentials import read_credentials
 
-def load_credentials(credentials_file: Path) -> tuple[str, str, str, str]:
-    """Load credentials, URL, and workflow path from the credentials file."""
-    if not credentials_file.exists():
-        raise FileNotFoundError(f"Credentials file not found: {credentials_file}")
-    
-    content = credentials_file.read_text().strip()
-    non_comment_lines = []
-    for line in content.split("\n"):
-        line = line.strip()
-        if line and not line.startswith("#"):
-            non_comment_lines.append(line)
-    
-    username = password = url = workflow_path = None
-    
-    if len(non_comment_lines) >= 1 and ":" in non_comment_lines[0]:
-        username, password = non_comment_lines[0].split(":", 1)
-        username = username.strip()
-        password = password.strip()
-    
-    if len(non_comment_lines) >= 2:
-        url = non_comment_lines[1].strip()
-    
-    if len(non_comment_lines) >= 3:
-        workflow_path = non_comment_lines[2].strip()
-    
-    return username, password, url, workflow_path
+# Sidebar button that opens the workflow panel; present once ComfyUI has rendered
+WORKFLOW_BUTTON_SELECTOR = "i.icon-\\[comfy--workflow\\].side-bar-button-icon"
+
+
+# Panel check, folder expand and file click in a single round-trip. Returns
+# {panel, folder, file}. A collapsed folder is expanded and its children
+# awaited with a MutationObserver before the file is clicked; a closed panel
+# stops the script, so the caller opens it and runs the script again.
+_OPEN_WORKFLOW_JS = """
+async () => {
+    const [folderName, fileName] = %s;
+    const panel = document.querySelector('.comfyui-workflows-panel');
+    const sideBar = panel && panel.closest('.side-bar-panel');
+    if (!sideBar || window.getComputedStyle(sideBar).display === 'none') {
+        return {panel: 'closed'};
+    }
+
+    // One DOM scan shared by the folder and file lookups
+    const spans = Array.from(document.querySelectorAll('span'));
+    const byText = text => spans.find(s => s.textContent.trim() === text);
+    // Debug: the tree entries that were found instead
+    const editable = () => spans
+        .filter(s => s.matches('span.editable-text span'))
+        .map(s => s.textContent.trim());
+
+    const folderSpan = byText(folderName);
+    if (!folderSpan) {
+        return {panel: 'open', folder: 'Folder not found. Found: ' + JSON.stringify(editable())};
+    }
+    const treeNode = folderSpan.closest('.p-tree-node');
+    if (!treeNode) return {panel: 'open', folder: 'Tree node not found'};
+    let folder = 'Already expanded';
+    if (treeNode.getAttribute('aria-expanded') !== 'true') {
+        const toggleButton = treeNode.querySelector('button.p-tree-node-toggle-button');
+        if (!toggleButton) return {panel: 'open', folder: 'Toggle button not found'};
+        toggleButton.click();
 
+        // Resolve as soon as the children render instead of sleeping
+        const expanded = await new Promise(resolve => {
+            const done = value => {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(value);
+            };
+            const check = () => {
+                if (treeNode.querySelector('.p-tree-node-children')) done(true);
+            };
+            const observer = new MutationObserver(check);
+            const timer = setTimeout(() => done(false), %d);
+            observer.observe(treeNode, {childList: true, subtree: true});
+            check();
+        });
+        if (!expanded) return {panel: 'open', folder: 'Folder did not expand'};
+        folder = 'Expanded';
+    }
 
-def open_workflow(client: BrowserClient, workflow_path: str):
-    """Open a workflow in ComfyUI."""
+    // The file is a child of the folder's tree node, which may be newer
+    // than the span scan above
+    const fileSpan = Array.from(treeNode.querySelectorAll('span'))
+        .find(s => s.textContent.trim() === fileName);
+    if (!fileSpan) {
+        return {panel: 'open', folder,
+                file: 'File not found. Found: ' + JSON.stringify(editable())};
+    }
+    fileSpan.click();
+    return {panel: 'open', folder, file: 'Clicked'};
+}
+"""
+
+
+def _workflow_state(client: BrowserClient, script: str) -> dict:
+    """Run the open-workflow script, returning its state dict ({"error": message} on failure)."""
+    result = client.eval_js(script)
+    if result.get("status") != "success":
+        return {"error": result.get("message")}
+    return result.get("result") or {}
+
+
+def open_workflow(client: BrowserClient, workflow_path: str, expand_timeout: int = 2000):
+    """
+    Open a workflow in ComfyUI.
+
+    The panel check, folder expand and file click share one eval_js call,
+    which waits in the page (up to ``expand_timeout`` ms) for a collapsed
+    folder's children to render. Only opening the panel costs extra
+    round-trips.
+    """
     print(f"🔧 Opening workflow: {workflow_path}")
     
+    # Parse workflow path (e.g., "UmeAiRT/WAN2.2_IMG_to_VIDEO_Base.json")
+    parts = workflow_path.split("/")
+    if len(parts) != 2:
+        print(f"   ❌ Invalid workflow path format. Expected: folder/file.json")
+        return False
+    
+    folder_name, file_name = parts
+    script = _OPEN_WORKFLOW_JS % (json.dumps([folder_name, file_name]), expand_timeout)
+    
     # Step 1: Check if workflow panel is already open, if not, open it
     print("   1. Checking/opening workflow sidebar panel...")
-    check_panel_js = """
-    (function() {
-        const panel = document.querySelector('.comfyui-workflows-panel');
-        if (!panel) return 'closed';
-        const style = window.getComputedStyle(panel.closest('.side-bar-panel'));
-        if (style.display === 'none') return 'closed';
-        return 'open';
-    })()
-    """
-    result = client.eval_js(check_panel_js)
-    panel_state = result.get("result", "closed")
+    state = _workflow_state(client, script)
     
-    if panel_state == "closed":
+    if state.get("panel", "closed") == "closed":
         print("      Panel is closed, opening it...")
-        result = client.click("i.icon-\\[comfy--workflow\\].side-bar-button-icon")
+        result = client.click(WORKFLOW_BUTTON_SELECTOR)
         if result.get("status") != "success":
             print(f"   ❌ Failed to click workflow button: {result.get('message')}")
             return False
         
-        # Wait for workflow panel content to load
+        # Wait for workflow panel content to load; the tree nodes being
+        # present is enough for the script to find the folder
         print("      Waiting for workflow panel to load...")
         result = client.wait(".comfyui-workflows-panel .p-tree-node", timeout=10000)
         if result.get("status") != "success":
             print(f"   ❌ Workflow panel content did not load: {result.get('message')}")
             return False
         
-        time.sleep(0.5)  # Small additional wait for rendering
+        state = _workflow_state(client, script)
     else:
         print("      Panel is already open")
     
-    # Step 2: Parse workflow path (e.g., "UmeAiRT/WAN2.2_IMG_to_VIDEO_Base.json")
-    parts = workflow_path.split("/")
-    if len(parts) != 2:
-        print(f"   ❌ Invalid workflow path format. Expected: folder/file.json")
-        return False
-    
-    folder_name = parts[0]
-    file_name = parts[1]
-    
-    # Step 3: Check if folder is already expanded, if not, expand it
+    # Step 2: Check if folder is already expanded, if not, expand it
     print(f"   2. Checking/expanding folder: {folder_name}")
-    check_expand_js = f"""
-    (function() {{
-        // Find all span elements that might contain the folder name
-        const allSpans = Array.from(document.querySelectorAll('span'));
-        const folderSpan = allSpans.find(s => s.textContent.trim() === '{folder_name}');
-        if (!folderSpan) {{
-            // Debug: return what we found
-            const editable = Array.from(document.querySelectorAll('span.editable-text span')).map(s => s.textContent.trim());
-            return 'Folder not found. Found: ' + JSON.stringify(editable);
-        }}
-        
-        // Find the toggle button - go up to tree node and check if expanded
-        const treeNode = folderSpan.closest('.p-tree-node');
-        if (!treeNode) return 'Tree node not found';
-        
-        // Check if already expanded (aria-expanded attribute)
-        const isExpanded = treeNode.getAttribute('aria-expanded') === 'true';
-        if (isExpanded) return 'Already expanded';
-        
-        const toggleButton = treeNode.querySelector('button.p-tree-node-toggle-button');
-        if (!toggleButton) return 'Toggle button not found';
-        
-        toggleButton.click();
-        return 'Clicked';
-    }})()
-    """
-    result = client.eval_js(check_expand_js)
-    expand_result = result.get("result", "")
+    expand_result = state.get("folder", "")
     
-    if expand_result.startswith("Folder not found"):
-        print(f"   ❌ {expand_result}")
-        return False
-    elif expand_result == "Already expanded":
+    if expand_result == "Already expanded":
         print(f"      Folder is already expanded")
-    elif expand_result == "Clicked":
+    elif expand_result == "Expanded":
         print(f"      Expanded folder")
-        time.sleep(1)  # Wait for folder to expand and show children
+    elif expand_result.startswith("Folder not found"):
+        print(f"   ❌ {expand_result}")
+        return False
     else:
-        print(f"   ❌ Unexpected result: {expand_result}")
+        print(f"   ❌ Unexpected result: {expand_result or state.get('error')}")
         return False
     
-    # Step 4: Click the workflow file using JavaScript
+    # Step 3: The script clicks the file as soon as the folder is expanded
     print(f"   3. Opening workflow file: {file_name}")
-    click_file_js = f"""
-    (function() {{
-        // Find all span elements with the file name
-        const allSpans = Array.from(document.querySelectorAll('span'));
-        const fileSpan = allSpans.find(s => s.textContent.trim() === '{file_name}');
-        if (!fileSpan) {{
-            // Debug: return what we found
-            const editable = Array.from(document.querySelectorAll('span.editable-text span')).map(s => s.textContent.trim());
-            return 'File not found. Found: ' + JSON.stringify(editable);
-        }}
-        
-        fileSpan.click();
-        return 'Clicked';
-    }})()
-    """
-    result = client.eval_js(click_file_js)
-    if result.get("status") != "success" or not result.get("result", "").startswith("Clicked"):
-        print(f"   ❌ Failed to open workflow file: {result.get('result', result.get('message'))}")
+    if state.get("file") != "Clicked":
+        print(f"   ❌ Failed to open workflow file: {state.get('file') or state.get('error')}")
         return False
     
     print(f"✅ Workflow opened successfully!")
@@ -189,7 +197,7 @@ def main():
     workflow_path = args.workflow
     if not workflow_path:
         try:
-            _, _, _, workflow_path = load_credentials(args.credentials_file)
+            workflow_path = read_credentials(args.credentials_file).workflow_path
             if not workflow_path:
                 print("❌ No workflow path specified and none found in credentials file")
                 return 1
@@ -9,10 +9,7 @@ from browser_agent.browser.actions import Action, Navigate, WaitForSelector
 from browser_agent.browser.observation import PageObservation
 from browser_agent.agent.task_spec import TaskState
 
-# Import task spec from the same package
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent))
+# Sibling module; the scripts run from this directory, so it is importable
 from task_spec_vastai import VastAiAuthTaskSpec
 
 
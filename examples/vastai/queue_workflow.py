@@ -6,11 +6,13 @@ This script sets the batch count and clicks the run button to queue executions.
 """
 from pathlib import Path
 import sys
-import time
 
-# Add src to path for imports
+# Add src to path for imports when run as a script; under api_server the
+# path is already there
 project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "src"))
+_SRC_DIR = str(project_root / "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 from browser_agent.server.browser_client import BrowserClient
 
@@ -25,19 +27,38 @@ def queue_workflow(client: BrowserClient, num_iterations: int = 1):
         
         # First, clear the current value and set the new one
         set_batch_js = f"""
-        (function() {{
+        async () => {{
             const input = document.querySelector('.batch-count input.p-inputnumber-input');
             if (!input) return 'Batch count input not found';
             
             // Clear and set new value
-            input.value = '{num_iterations}';
+            const expected = '{num_iterations}';
+            input.value = expected;
             
             // Trigger input event to update the component
             input.dispatchEvent(new Event('input', {{ bubbles: true }}));
             input.dispatchEvent(new Event('change', {{ bubbles: true }}));
             
-            return 'Set to ' + input.value;
-        }})()
+            // Wait for the widget to take the value: PrimeVue's InputNumber
+            // mirrors its model into aria-valuenow once it has processed the
+            // input. A timer bounds the wait even where the page is hidden.
+            const confirmed = await new Promise(resolve => {{
+                const done = value => {{
+                    observer.disconnect();
+                    clearTimeout(timer);
+                    resolve(value);
+                }};
+                const check = () => {{
+                    if (input.getAttribute('aria-valuenow') === expected) done(true);
+                }};
+                const observer = new MutationObserver(check);
+                const timer = setTimeout(() => done(false), 1000);
+                observer.observe(input, {{attributes: true, attributeFilter: ['aria-valuenow']}});
+                check();
+            }});
+            
+            return 'Set to ' + input.value + (confirmed ? '' : ' (not confirmed by the widget)');
+        }}
         """
         result = client.eval_js(set_batch_js)
         if result.get("status") != "success":
@@ -50,23 +71,43 @@ def queue_workflow(client: BrowserClient, num_iterations: int = 1):
             return False
         
         print(f"      {set_result}")
-        time.sleep(1)  # Wait for UI to process the input change
     else:
         print(f"   1. Batch count already set to 1, skipping...")
     
     # Step 2: Click the Run button
     print(f"   2. Clicking Run button...")
     run_button_js = """
-    (function() {
+    async () => {
         const runButton = document.querySelector('.comfyui-queue-button button.p-splitbutton-button');
         if (!runButton) return 'Run button not found';
         
         // Check if button is disabled
         if (runButton.disabled) return 'Run button is disabled';
         
-        runButton.click();
+        // Return once the click produces a toast, dialog or queue item, or
+        // after 500ms; other mutations (such as the button's own re-render)
+        // do not count, so the error check below sees the toast
+        const reaction = '.p-toast-message, .p-message, [role="alert"], '
+            + '.p-dialog-visible, [role="dialog"][aria-modal="true"], '
+            + '[data-testid="queue-item"], .queue-item';
+        await new Promise(resolve => {
+            const done = () => {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve();
+            };
+            const observer = new MutationObserver(mutations => {
+                const appeared = mutations.some(m => Array.from(m.addedNodes).some(node =>
+                    node.nodeType === Node.ELEMENT_NODE
+                    && (node.matches(reaction) || node.querySelector(reaction))));
+                if (appeared) done();
+            });
+            const timer = setTimeout(done, 500);
+            observer.observe(document.body, {childList: true, subtree: true});
+            runButton.click();
+        });
         return 'Clicked';
-    })()
+    }
     """
     result = client.eval_js(run_button_js)
     if result.get("status") != "success":
@@ -81,9 +122,6 @@ def queue_workflow(client: BrowserClient, num_iterations: int = 1):
         print(f"   ❌ Failed to click run button: {click_result}")
         return False
     
-    # Wait a moment and check if anything was queued
-    time.sleep(0.5)
-    
     # Step 3: Check for error messages or dialogs
     print(f"   3. Checking for errors or dialogs...")
     check_errors_js = """
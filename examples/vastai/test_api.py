@@ -4,67 +4,145 @@ Test script for the VastAI API server.
 
 This script tests all API endpoints to ensure they work correctly.
 """
-import requests
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import random
 import time
 import sys
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+
+from credentials import load_credentials
+
+# (connect, read) timeouts in seconds so a wedged server cannot hang the run;
+# starting a session launches a browser and opens the workflow, so its read
+# timeout is longer
+TIMEOUT = (2.0, 10.0)
+START_TIMEOUT = (2.0, 120.0)
+
+# Bodies of the fixed-shape probes, serialized once rather than per request
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_PAYLOADS = {
+    "open": json.dumps({"workflow_path": "test.json"}).encode(),
+    "queue": json.dumps({"iterations": 1}).encode(),
+}
+
+
+def new_session() -> requests.Session:
+    """
+    Create an HTTP session for requests to the API server.
+
+    Requests sent on one session reuse its connection to the server
+    instead of reconnecting for each one.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def wait_for_active(
+    session: requests.Session,
+    base_url: str,
+    max_retries: int = 6,
+    base_delay: float = 0.1,
+    cap: float = 5.0,
+) -> dict | None:
+    """
+    Poll /session/status until the session is active.
+
+    The delay between polls starts at ``base_delay`` seconds and doubles up
+    to ``cap``, with up to 50% jitter added, so a server that is already up
+    is seen on the first poll.
+
+    A poll that times out counts as a failed attempt and is retried.
+
+    Returns:
+        The status response once active, or None after ``max_retries`` polls.
+    """
+    status_url = f"{base_url}/session/status"
+    for attempt in range(max_retries):
+        try:
+            response = session.get(status_url, timeout=TIMEOUT)
+        except requests.Timeout:
+            pass
+        else:
+            response.raise_for_status()
+            data = response.json()
+            if data['active']:
+                return data
+        if attempt < max_retries - 1:
+            delay = min(cap, base_delay * 2 ** attempt)
+            time.sleep(delay * (1 + random.uniform(0, 0.5)))
+    return None
+
+
+def _probe(method: str, url: str, **kwargs) -> requests.Response:
+    """Send one request on a session of its own, for use from a worker thread."""
+    # requests does not document Session as thread-safe, so concurrent
+    # probes do not share one
+    with new_session() as session:
+        return session.request(method, url, timeout=TIMEOUT, **kwargs)
+
 
 def test_api(base_url: str = "http://localhost:8000"):
     """Test all API endpoints."""
     print(f"🧪 Testing VastAI API at {base_url}\n")
     
-    # Test 1: Root endpoint
-    print("1. Testing root endpoint...")
+    # The probes are independent, so send them all at once and report on
+    # each in turn; a failed request re-raises from .result()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        root_probe, status_probe, open_probe, queue_probe = (
+            pool.submit(_probe, "GET", f"{base_url}/"),
+            pool.submit(_probe, "GET", f"{base_url}/session/status"),
+            pool.submit(_probe, "POST", f"{base_url}/workflow/open",
+                        data=_PAYLOADS["open"], headers=_JSON_HEADERS),
+            pool.submit(_probe, "POST", f"{base_url}/workflow/queue",
+                        data=_PAYLOADS["queue"], headers=_JSON_HEADERS),
+        )
+    
+    # One handler for the whole suite: any failed request or malformed
+    # response ends the run under the step that raised it
     try:
-        response = requests.get(f"{base_url}/")
+        # Test 1: Root endpoint
+        print("1. Testing root endpoint...")
+        response = root_probe.result()
         response.raise_for_status()
         data = response.json()
         print(f"   ✅ Root endpoint: {data['name']}")
         print(f"      Available endpoints: {len(data['endpoints'])}")
-    except Exception as e:
-        print(f"   ❌ Failed: {e}")
-        return False
-    
-    # Test 2: Session status (should be inactive)
-    print("\n2. Testing session status (should be inactive)...")
-    try:
-        response = requests.get(f"{base_url}/session/status")
+        
+        # Test 2: Session status (should be inactive)
+        print("\n2. Testing session status (should be inactive)...")
+        response = status_probe.result()
         response.raise_for_status()
         data = response.json()
         if not data['active']:
             print(f"   ✅ Session inactive as expected")
         else:
             print(f"   ⚠️  Session already active on port {data.get('port')}")
-    except Exception as e:
-        print(f"   ❌ Failed: {e}")
-        return False
-    
-    # Test 3: Try to open workflow without session (should fail)
-    print("\n3. Testing workflow open without session (should fail)...")
-    try:
-        response = requests.post(f"{base_url}/workflow/open", json={
-            "workflow_path": "test.json"
-        })
+        
+        # Test 3: Try to open workflow without session (should fail)
+        print("\n3. Testing workflow open without session (should fail)...")
+        response = open_probe.result()
         if response.status_code == 400:
             print(f"   ✅ Correctly rejected: {response.json()['detail']}")
         else:
             print(f"   ⚠️  Unexpected status: {response.status_code}")
-    except Exception as e:
-        print(f"   ❌ Failed: {e}")
-        return False
-    
-    # Test 4: Try to queue workflow without session (should fail)
-    print("\n4. Testing workflow queue without session (should fail)...")
-    try:
-        response = requests.post(f"{base_url}/workflow/queue", json={
-            "iterations": 1
-        })
+        
+        # Test 4: Try to queue workflow without session (should fail)
+        print("\n4. Testing workflow queue without session (should fail)...")
+        response = queue_probe.result()
         if response.status_code == 400:
             print(f"   ✅ Correctly rejected: {response.json()['detail']}")
         else:
             print(f"   ⚠️  Unexpected status: {response.status_code}")
-    except Exception as e:
+    except (requests.RequestException, KeyError) as e:
         print(f"   ❌ Failed: {e}")
         return False
     
@@ -84,74 +162,108 @@ def test_api(base_url: str = "http://localhost:8000"):
     return True
 
 
-def test_with_credentials(base_url: str, username: str, password: str, url: str, workflow_path: str = None):
+class SessionHarness:
+    """
+    Browser session on the API server for the duration of a ``with`` block.
+
+    Starting a session launches a browser, so every check in the block
+    shares one session. It is stopped on exit, including when a check
+    fails; ``stop()`` ends it earlier and reports the server's answer.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        base_url: str,
+        credentials: dict,
+        headless: bool = True,
+        port: int = 9999,
+    ):
+        self.session = session
+        self.base_url = base_url
+        self.request = {"credentials": credentials, "headless": headless, "port": port}
+        self.message = ""
+        self.details: dict = {}
+        self._active = False
+
+    def __enter__(self) -> SessionHarness:
+        response = self.session.post(
+            f"{self.base_url}/session/start", json=self.request, timeout=START_TIMEOUT
+        )
+        response.raise_for_status()
+        data = response.json()
+        if not data['success']:
+            raise RuntimeError(data['message'])
+        self._active = True
+        self.details = data.get('details', {})
+        self.message = data['message']
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._active:
+            self.stop()
+
+    def stop(self) -> dict:
+        """Stop the session and return the server's response."""
+        self._active = False
+        response = self.session.post(f"{self.base_url}/session/stop", timeout=TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+
+def test_with_credentials(
+    base_url: str,
+    username: str,
+    password: str,
+    url: str,
+    workflow_path: str = None,
+    session: requests.Session | None = None,
+):
     """Test API with actual credentials (requires vast.ai instance)."""
+    session = session or new_session()
     print(f"🧪 Testing VastAI API with credentials at {base_url}\n")
     
+    credentials = {
+        "username": username,
+        "password": password,
+        "url": url
+    }
+    if workflow_path:
+        credentials["workflow_path"] = workflow_path
+    
     # Start session
     print("1. Starting authenticated session...")
+    if workflow_path:
+        print(f"   Including workflow path: {workflow_path}")
     try:
-        credentials = {
-            "username": username,
-            "password": password,
-            "url": url
-        }
-        if workflow_path:
-            credentials["workflow_path"] = workflow_path
-            print(f"   Including workflow path: {workflow_path}")
-        
-        response = requests.post(f"{base_url}/session/start", json={
-            "credentials": credentials,
-            "headless": True,
-            "port": 9999
-        })
-        response.raise_for_status()
-        data = response.json()
-        if data['success']:
-            print(f"   ✅ {data['message']}")
-            details = data.get('details', {})
+        with SessionHarness(session, base_url, credentials) as harness:
+            print(f"   ✅ {harness.message}")
+            details = harness.details
             print(f"      Port: {details.get('port')}")
             print(f"      Headless: {details.get('headless')}")
             if details.get('workflow_opened'):
                 print(f"      Workflow opened: {details.get('workflow_path')}")
-        else:
-            print(f"   ❌ Failed: {data['message']}")
-            return False
-    except Exception as e:
-        print(f"   ❌ Failed: {e}")
-        return False
-    
-    # Wait for server to fully start
-    print("\n   Waiting for browser server to initialize...")
-    time.sleep(3)
-    
-    # Check status
-    print("\n2. Checking session status...")
-    try:
-        response = requests.get(f"{base_url}/session/status")
-        response.raise_for_status()
-        data = response.json()
-        if data['active']:
-            print(f"   ✅ Session active on port {data['port']}")
-            print(f"      URL: {data.get('url', 'N/A')}")
-        else:
-            print(f"   ❌ Session not active")
-            return False
-    except Exception as e:
-        print(f"   ❌ Failed: {e}")
-        return False
-    
-    # Stop session
-    print("\n3. Stopping session...")
-    try:
-        response = requests.post(f"{base_url}/session/stop")
-        response.raise_for_status()
-        data = response.json()
-        if data['success']:
-            print(f"   ✅ {data['message']}")
-        else:
-            print(f"   ⚠️  {data['message']}")
-    except Exception as e:
+            
+            # Check status, polling until the browser server has initialized
+            print("\n2. Checking session status...")
+            data = wait_for_active(session, base_url)
+            if data:
+                print(f"   ✅ Session active on port {data['port']}")
+                print(f"      URL: {data.get('url', 'N/A')}")
+            else:
+                print(f"   ❌ Session not active")
+                return False
+            
+            # Stop session
+            print("\n3. Stopping session...")
+            data = harness.stop()
+            if data['success']:
+                print(f"   ✅ {data['message']}")
+            else:
+                print(f"   ⚠️  {data['message']}")
+    # RuntimeError is the harness reporting a session that did not start;
+    # anything else is a bug in this script and keeps its traceback
+    except (requests.RequestException, KeyError, RuntimeError) as e:
         print(f"   ❌ Failed: {e}")
         return False
     
@@ -159,34 +271,6 @@ def test_with_credentials(base_url: str, username: str, password: str, url: str,
     return True
 
 
-def load_credentials(credentials_file: Path) -> tuple[str, str, str, str]:
-    """Load credentials from file."""
-    if not credentials_file.exists():
-        return None, None, None, None
-    
-    content = credentials_file.read_text().strip()
-    non_comment_lines = []
-    for line in content.split("\n"):
-        line = line.strip()
-        if line and not line.startswith("#"):
-            non_comment_lines.append(line)
-    
-    username = password = url = workflow_path = None
-    
-    if len(non_comment_lines) >= 1 and ":" in non_comment_lines[0]:
-        username, password = non_comment_lines[0].split(":", 1)
-        username = username.strip()
-        password = password.strip()
-    
-    if len(non_comment_lines) >= 2:
-        url = non_comment_lines[1].strip()
-    
-    if len(non_comment_lines) >= 3:
-        workflow_path = non_comment_lines[2].strip()
-    
-    return username, password, url, workflow_path
-
-
 def main():
     import argparse
     
@@ -213,26 +297,39 @@ def main():
     
     args = parser.parse_args()
     
-    # Basic API tests
-    success = test_api(args.url)
-    if not success:
-        return 1
-    
-    # Test with credentials if requested
-    if args.with_credentials:
-        credentials_path = Path(__file__).parent.parent.parent / args.credentials_file
-        username, password, url, workflow_path = load_credentials(credentials_path)
+    # The probes in test_api run concurrently on sessions of their own; the
+    # credential tests share one session (and connection)
+    with new_session() as session:
+        # Basic API tests
+        success = test_api(args.url)
+        if not success:
+            return 1
         
-        if not all([username, password, url]):
-            print(f"\n⚠️  Could not load credentials from {credentials_path}")
-            print("   Skipping credential tests")
-        else:
-            print(f"\n{'='*60}\n")
-            success = test_with_credentials(args.url, username, password, url, workflow_path)
-            if not success:
-                return 1
-    
-    return 0
+        # Test with credentials if requested
+        if args.with_credentials:
+            credentials_path = Path(__file__).parent.parent.parent / args.credentials_file
+            try:
+                credentials = load_credentials(credentials_path)
+            except (FileNotFoundError, ValueError):
+                credentials = None
+        
+            if credentials is None:
+                print(f"\n⚠️  Could not load credentials from {credentials_path}")
+                print("   Skipping credential tests")
+            else:
+                print(f"\n{'='*60}\n")
+                success = test_with_credentials(
+                    args.url,
+                    credentials.username,
+                    credentials.password,
+                    credentials.url,
+                    credentials.workflow_path,
+                    session=session,
+                )
+                if not success:
+                    return 1
+        
+        return 0
 
 
 if __name__ == "__main__":
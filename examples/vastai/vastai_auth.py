@@ -17,9 +17,11 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
-# Add src to path for imports
+# Add src to path for imports, without a duplicate entry if it is already there
 project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "src"))
+_SRC_DIR = str(project_root / "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 from browser_agent.agent.core import Agent
 from browser_agent.browser.playwright_driver import PlaywrightBrowserController
@@ -28,69 +30,7 @@ from browser_agent.config import Settings
 # Import from local module
 from task_spec_vastai import VastAiAuthTaskSpec
 from policy_vastai import VastAiAuthPolicy
-
-
-def load_credentials(credentials_file: Path) -> tuple[str, str, str, str]:
-    """Load credentials, URL, and workflow path from the credentials file.
-    
-    Returns:
-        tuple[str, str, str, str]: username, password, url, workflow_path
-    """
-    if not credentials_file.exists():
-        raise FileNotFoundError(
-            f"Credentials file not found: {credentials_file}\n"
-            "Please create it with format:\n"
-            "  Line 1: username:password\n"
-            "  Line 2: url\n"
-            "  Line 3: workflow_path"
-        )
-    
-    content = credentials_file.read_text().strip()
-    username = None
-    password = None
-    url = None
-    workflow_path = None
-    
-    # Parse the file looking for credentials, URL, and workflow
-    non_comment_lines = []
-    for line in content.split("\n"):
-        line = line.strip()
-        if line and not line.startswith("#"):
-            non_comment_lines.append(line)
-    
-    # First line with colon is username:password
-    if len(non_comment_lines) >= 1 and ":" in non_comment_lines[0]:
-        username, password = non_comment_lines[0].split(":", 1)
-        username = username.strip()
-        password = password.strip()
-    
-    # Second line is URL
-    if len(non_comment_lines) >= 2:
-        url = non_comment_lines[1].strip()
-    
-    # Third line is workflow path (optional)
-    if len(non_comment_lines) >= 3:
-        workflow_path = non_comment_lines[2].strip()
-    
-    if not username or not password:
-        raise ValueError(
-            f"Invalid credentials format in {credentials_file}\n"
-            "Expected format:\n"
-            "  Line 1: username:password\n"
-            "  Line 2: url\n"
-            "  Line 3: workflow_path (optional)"
-        )
-    
-    if not url:
-        raise ValueError(
-            f"URL not found in {credentials_file}\n"
-            "Expected format:\n"
-            "  Line 1: username:password\n"
-            "  Line 2: url\n"
-            "  Line 3: workflow_path (optional)"
-        )
-    
-    return username, password, url, workflow_path
+from credentials import load_credentials
 
 
 def main():
@@ -120,7 +60,9 @@ def main():
     
     # Load credentials, URL, and workflow
     try:
-        username, password, url, workflow_path = load_credentials(args.credentials_file)
+        credentials = load_credentials(args.credentials_file)
+        username, password = credentials.username, credentials.password
+        url, workflow_path = credentials.url, credentials.workflow_path
         print(f"Loaded credentials for user: {username}")
         print(f"Loaded URL: {url}")
         if workflow_path:
@@ -159,14 +101,16 @@ def main():
         
         if result == "success":
             print("\n✅ Successfully authenticated!")
-            print(f"   Final URL: {browser.observe().url}")
-            print(f"   Page title: {browser.observe().title}")
+            obs = browser.get_observation()
+            print(f"   Final URL: {obs.url}")
+            print(f"   Page title: {obs.title}")
             print("\nBrowser will remain open. Press Enter to close...")
             input()
         elif result == "failed":
             print("\n❌ Authentication failed!")
-            print(f"   Current URL: {browser.observe().url}")
-            print(f"   Page title: {browser.observe().title}")
+            obs = browser.get_observation()
+            print(f"   Current URL: {obs.url}")
+            print(f"   Page title: {obs.title}")
         else:
             print(f"\n⚠️  Task incomplete: {result}")
     
@@ -6,9 +6,11 @@ This allows you to control a persistent browser instance without re-authenticati
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import socket
 import sys
+import threading
 
 
 class BrowserClient:
@@ -27,21 +29,52 @@ class BrowserClient:
         # Extract links
         result = client.extract("a[href*='/items/']")
         links = result.get('links', [])
+    
+    Used as a context manager, the client keeps one connection open and
+    sends every command over it instead of reconnecting per command:
+    
+        with BrowserClient() as client:
+            client.goto("https://example.com")
+            client.extract("a")
     """
     
-    def __init__(self, host: str = "localhost", port: int = 9999):
+    def __init__(self, host: str = "localhost", port: int = 9999, keep_alive: bool = False):
         """
         Initialize the browser client.
         
         Args:
             host: Server hostname (default: localhost)
             port: Server port (default: 9999)
+            keep_alive: Reuse one connection for all commands, as when used
+                as a context manager; call close() when done (default: False)
         """
         self.host = host
         self.port = port
+        self._libraries: set[str] = set()
+        self._keep_alive = keep_alive
+        self._sock: socket.socket | None = None
+        self._sock_lock = threading.Lock()
+        self._next_id = 0
+    
+    def __enter__(self) -> BrowserClient:
+        self._keep_alive = True
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._keep_alive = False
+        self.close()
+    
+    def close(self) -> None:
+        """Close the keep-alive connection, if one is open."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
     
     def send_command(self, command: dict) -> dict:
         """Send a command to the browser server and get the response."""
+        if self._keep_alive:
+            with self._sock_lock:
+                return self._send_keep_alive(command)
         try:
             client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             client_socket.connect((self.host, self.port))
@@ -76,6 +109,79 @@ class BrowserClient:
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
+    def _send_keep_alive(self, command: dict) -> dict:
+        """
+        Send a command over the persistent connection, opening it if needed.
+        
+        Commands and responses are newline-delimited JSON tagged with a
+        request id. If the command cannot be written to a reused connection
+        the server has closed, it is sent once more on a fresh connection.
+        Once written it is never resent, since the server may already have
+        run it; a connection that closes before the response arrives is
+        reported as an error.
+        """
+        self._next_id += 1
+        request_id = self._next_id
+        payload = json.dumps({**command, "keep_alive": True, "id": request_id}).encode() + b"\n"
+        try:
+            for _ in range(2):
+                reused = self._sock is not None
+                if not reused:
+                    self._sock = socket.create_connection((self.host, self.port))
+                response = self._exchange(payload, request_id)
+                if response is not None:
+                    return response
+                self.close()
+                if not reused:
+                    break
+            return {"status": "error", "message": "Connection closed by browser server"}
+        except ConnectionRefusedError:
+            self.close()
+            return {
+                "status": "error",
+                "message": "Could not connect to browser server. Is it running?"
+            }
+        except Exception as e:
+            self.close()
+            return {"status": "error", "message": str(e)}
+    
+    def _exchange(self, payload: bytes, request_id: int) -> dict | None:
+        """
+        Send one request and read its response from the open connection.
+        
+        Returns None if the request could not be written, so it is safe to
+        resend. Responses left over from an interrupted earlier command
+        carry a different id and are skipped.
+        """
+        try:
+            self._sock.sendall(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            return None
+        
+        buffer = b""
+        while True:
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                response = json.loads(line.decode())
+                if response.pop("id", None) == request_id:
+                    return response
+            try:
+                chunk = self._sock.recv(65536)
+            except ConnectionResetError:
+                chunk = b""
+            if not chunk:
+                if not buffer:
+                    self.close()
+                    return {
+                        "status": "error",
+                        "message": "Connection closed by browser server before it responded"
+                    }
+                # Servers still waiting for 'ready' reply without a newline
+                # and close the connection
+                self.close()
+                return json.loads(buffer.decode())
+            buffer += chunk
+    
     def goto(self, url: str) -> dict:
         """Navigate to a URL."""
         return self.send_command({"action": "goto", "url": url})
@@ -88,6 +194,19 @@ class BrowserClient:
             "timeout": timeout
         })
     
+    def click_first_of(self, selectors: list[str], timeout: int = 5000) -> dict:
+        """
+        Click the first of several candidate selectors that matches.
+        
+        The candidates are resolved by the server in a single round-trip;
+        the response's ``selector`` field names the one that was clicked.
+        """
+        return self.send_command({
+            "action": "click_first_of",
+            "selectors": selectors,
+            "timeout": timeout
+        })
+    
     def wait(self, selector: str, timeout: int = 10000) -> dict:
         """Wait for an element to appear."""
         return self.send_command({
@@ -117,6 +236,76 @@ class BrowserClient:
             "code": code
         })
     
+    async def eval_js_async(self, code: str) -> dict:
+        """
+        Execute JavaScript code without blocking the event loop.
+        
+        Runs eval_js in a worker thread so callers can overlap it with other
+        awaitables. The server handles one command at a time, so independent
+        scripts for the same page are cheaper as a single eval_js_batch.
+        """
+        return await asyncio.to_thread(self.eval_js, code)
+    
+    def eval_js_batch(self, scripts: dict[str, str]) -> dict:
+        """
+        Execute several JavaScript functions in a single round-trip.
+        
+        Args:
+            scripts: Mapping of result key to a JS function expression
+                (e.g. ``"() => document.title"``); async functions are awaited
+        
+        Returns:
+            The eval_js response, whose ``result`` maps each key to the
+            return value of its function.
+        """
+        calls = ", ".join(f"({code})()" for code in scripts.values())
+        fields = ", ".join(
+            f"{json.dumps(key)}: r[{i}]" for i, key in enumerate(scripts)
+        )
+        return self.eval_js(f"() => Promise.all([{calls}]).then(r => ({{{fields}}}))")
+    
+    def install_library(self, name: str, source: str, force: bool = False) -> dict:
+        """
+        Install a JavaScript library on the current page once.
+        
+        Later calls can then evaluate short expressions such as
+        ``"() => myLib.doThing()"`` instead of resending the full source.
+        The page keeps an existing ``window[name]``; pass ``force=True``
+        after navigating, since a new document starts without it.
+        
+        Args:
+            name: Global the source assigns (``window[name]``)
+            source: JS statements defining the library
+            force: Re-send the source even if this client installed it before
+        """
+        if name in self._libraries and not force:
+            return {"status": "success", "result": False}
+        
+        result = self.eval_js(
+            f"() => {{ if (window[{json.dumps(name)}]) return false; {source}\n; return true; }}"
+        )
+        if result.get("status") == "success":
+            self._libraries.add(name)
+        return result
+    
+    def wait_for_js(self, code: str, timeout: int = 10000) -> dict:
+        """
+        Execute a JavaScript function returning a Promise and wait for it.
+        
+        The wait happens inside the browser, so event-driven code (e.g. a
+        MutationObserver) can resolve as soon as the page is ready instead of
+        being polled from Python.
+        
+        Args:
+            code: JS function expression returning a Promise
+            timeout: Maximum time to wait in milliseconds; on expiry the
+                response ``result`` is ``None``
+        """
+        return self.eval_js(
+            f"() => Promise.race([({code})(), "
+            f"new Promise(resolve => setTimeout(() => resolve(null), {int(timeout)}))])"
+        )
+    
     def download(self, url: str, save_path: str) -> dict:
         """Download a file from a URL."""
         return self.send_command({
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import json
 import socket
+import threading
 import traceback
 
 from ..browser.playwright_driver import PlaywrightBrowserController
@@ -49,6 +50,15 @@ class BrowserServer:
         self.running = False
         self.waiting_for_ready = False
         self.in_foreground = True  # Track if we're in foreground mode
+        # Set once the browser is up, the initial page has loaded and the
+        # server accepts commands; lets a thread that called start() wait
+        # for readiness without polling the port
+        self.ready = threading.Event()
+        # Set by stop(); checked by start() so a stop requested while the
+        # browser is still launching keeps the server from binding its port
+        self._stop_requested = threading.Event()
+        # Open keep-alive connections and their unparsed input
+        self._keep_alive: dict[socket.socket, bytes] = {}
     
     def _log(self, message: str, level: str = "INFO"):
         """Log a message to the log file."""
@@ -103,8 +113,14 @@ class BrowserServer:
             self.controller.perform(Navigate(initial_url))
             self.console.print(f"[dim]Navigated to {initial_url}[/dim]")
         
-        # Start socket server first
+        # Start socket server first. running is set before the stop check, so
+        # a stop() from here on clears it and the loops below exit
         self.running = True
+        if self._stop_requested.is_set():
+            self.running = False
+            self.controller.stop()
+            self.console.print("[dim]Server stopped before it was ready[/dim]")
+            return
         server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         server_socket.bind(('localhost', self.port))
@@ -136,9 +152,21 @@ class BrowserServer:
             self._wait_for_ready(server_socket, is_foreground)
         
         self.console.print(f"\n[bold green]✓ Server ready on port {self.port}[/bold green]")
+        self.ready.set()
         
         self._run_server_loop(server_socket)
     
+    def stop(self):
+        """
+        Stop the server from another thread.
+        
+        Safe to call at any point of start(): before the port is bound the
+        server shuts the browser down and returns without serving; after
+        that the server loop exits and stops the browser itself.
+        """
+        self._stop_requested.set()
+        self.running = False
+    
     def _wait_for_ready(self, server_socket: socket.socket, is_foreground: bool = True):
         """Wait for 'ready' command from interactive prompt or client."""
         import sys
@@ -321,8 +349,8 @@ class BrowserServer:
                     sys.stdout.flush()
                     prompt_needed = False
                 
-                # Use select to wait for either socket connection or stdin input
-                readable = [server_socket]
+                # Use select to wait for a connection, a keep-alive command or stdin input
+                readable = [server_socket, *self._keep_alive]
                 if self.in_foreground:
                     readable.append(sys.stdin)
                 
@@ -354,6 +382,10 @@ class BrowserServer:
                             self.console.print(f"\n[red]Error accepting connection: {e}[/red]")
                             prompt_needed = self.in_foreground  # Re-prompt after error
                 
+                for client_socket in ready_to_read:
+                    if client_socket in self._keep_alive:
+                        self._handle_keep_alive(client_socket)
+                
                 # Check if stdin has input (only in foreground)
                 if self.in_foreground and sys.stdin in ready_to_read:
                     command = sys.stdin.readline().strip().lower()
@@ -367,6 +399,9 @@ class BrowserServer:
         except KeyboardInterrupt:
             self.console.print("\n[yellow]Shutting down...[/yellow]")
         finally:
+            for client_socket in self._keep_alive:
+                client_socket.close()
+            self._keep_alive.clear()
             server_socket.close()
             if self.controller:
                 self.controller.stop()
@@ -423,7 +458,14 @@ class BrowserServer:
         return False  # Default: don't break
     
     def _handle_client(self, client_socket: socket.socket):
-        """Handle a client connection."""
+        """
+        Handle a client connection.
+        
+        A command sent with ``keep_alive`` leaves the connection open; further
+        newline-delimited commands on it are served from the main loop by
+        ``_handle_keep_alive`` until the client closes it.
+        """
+        keep_alive = False
         try:
             # Receive command (increased buffer for larger commands)
             data = client_socket.recv(65536)
@@ -431,16 +473,11 @@ class BrowserServer:
                 return
             
             command = json.loads(data.decode())
-            self.console.print(f"[cyan]← Command:[/cyan] {command.get('action')}")
-            
-            # Execute command in main thread
-            response = self._execute_command(command)
-            
-            # Send response
-            client_socket.sendall(json.dumps(response).encode())
-            self.console.print(f"[green]→ Response:[/green] {response.get('status')}")
+            keep_alive = bool(command.get("keep_alive"))
+            self._respond(client_socket, command)
             
         except Exception as e:
+            keep_alive = False
             error_response = {"status": "error", "message": str(e)}
             try:
                 client_socket.sendall(json.dumps(error_response).encode())
@@ -449,7 +486,50 @@ class BrowserServer:
             self.console.print(f"[red]Error: {e}[/red]")
             traceback.print_exc()
         finally:
+            if keep_alive:
+                self._keep_alive[client_socket] = b""
+            else:
+                client_socket.close()
+    
+    def _handle_keep_alive(self, client_socket: socket.socket):
+        """Serve the complete commands waiting on a keep-alive connection."""
+        try:
+            data = client_socket.recv(65536)
+        except OSError:
+            data = b""
+        if not data:
+            # Client closed the connection
+            del self._keep_alive[client_socket]
             client_socket.close()
+            return
+        
+        buffer = self._keep_alive[client_socket] + data
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            try:
+                self._respond(client_socket, json.loads(line.decode()))
+            except Exception as e:
+                del self._keep_alive[client_socket]
+                client_socket.close()
+                self.console.print(f"[red]Error: {e}[/red]")
+                return
+        self._keep_alive[client_socket] = buffer
+    
+    def _respond(self, client_socket: socket.socket, command: dict):
+        """Execute a command and send its response to the client."""
+        self.console.print(f"[cyan]← Command:[/cyan] {command.get('action')}")
+        
+        # Execute command in main thread
+        response = self._execute_command(command)
+        
+        # Send response; keep-alive responses echo the request id and are
+        # newline-terminated so several can share one connection
+        if command.get("keep_alive"):
+            response["id"] = command.get("id")
+            client_socket.sendall(json.dumps(response).encode() + b"\n")
+        else:
+            client_socket.sendall(json.dumps(response).encode())
+        self.console.print(f"[green]→ Response:[/green] {response.get('status')}")
     
     def _execute_command(self, command: dict) -> dict:
         """Execute a command and return the result."""
@@ -473,6 +553,27 @@ class BrowserServer:
                     self.controller._page.click(selector, timeout=timeout)
                 return {"status": "success"}
             
+            elif action == "click_first_of":
+                # Resolve candidates in priority order within one command
+                selectors = command.get("selectors") or []
+                timeout = command.get("timeout", 5000)
+                page = self.controller._page
+                if not page:
+                    return {"status": "error", "message": "No page available"}
+                if not selectors:
+                    return {"status": "error", "message": "No selectors provided"}
+                
+                page.wait_for_selector(", ".join(selectors), timeout=timeout)
+                for selector in selectors:
+                    element = page.query_selector(selector)
+                    if element:
+                        element.click(timeout=timeout)
+                        return {"status": "success", "selector": selector}
+                return {
+                    "status": "error",
+                    "message": f"No element found matching any of: {selectors}"
+                }
+            
             elif action == "wait":
                 selector = command.get("selector")
                 timeout = command.get("timeout", 10000)
@@ -3,6 +3,7 @@
 These are generic tests for the browser server/client architecture.
 Patreon-specific tests are in examples/patreon/tests/.
 """
+import asyncio
 import json
 import socket
 from unittest.mock import MagicMock, patch, Mock
@@ -284,6 +285,110 @@ class TestBrowserClientMocked:
         assert response["status"] == "success"
         assert len(response["html"]) == 100000
     
+    def test_keep_alive_reuses_connection(self):
+        """Test the context manager sends every command over one connection."""
+        mock_socket = MagicMock()
+        mock_socket.recv.side_effect = [
+            b'{"status": "success", "message": "pong", "id": 1}\n',
+            b'{"status": "success", "url": "https://example.com", "id": 2}\n',
+        ]
+        
+        with patch('socket.create_connection', return_value=mock_socket) as mock_connect:
+            with BrowserClient() as client:
+                assert client.ping() == {"status": "success", "message": "pong"}
+                assert client.info()["url"] == "https://example.com"
+        
+        mock_connect.assert_called_once_with(("localhost", 9999))
+        payloads = [c[0][0] for c in mock_socket.sendall.call_args_list]
+        assert all(p.endswith(b"\n") for p in payloads)
+        commands = [json.loads(p.decode()) for p in payloads]
+        assert commands == [
+            {"action": "ping", "keep_alive": True, "id": 1},
+            {"action": "info", "keep_alive": True, "id": 2},
+        ]
+        mock_socket.close.assert_called_once()
+    
+    def test_keep_alive_constructor_flag(self):
+        """Test keep_alive=True reuses a connection without a with block."""
+        mock_socket = MagicMock()
+        mock_socket.recv.side_effect = [
+            b'{"status": "success", "message": "pong", "id": 1}\n',
+            b'{"status": "success", "message": "pong", "id": 2}\n',
+        ]
+        
+        with patch('socket.create_connection', return_value=mock_socket) as mock_connect:
+            client = BrowserClient(keep_alive=True)
+            client.ping()
+            client.ping()
+            client.close()
+        
+        mock_connect.assert_called_once()
+        mock_socket.close.assert_called_once()
+    
+    def test_keep_alive_skips_stale_responses(self):
+        """Test responses to an interrupted earlier request are skipped."""
+        mock_socket = MagicMock()
+        mock_socket.recv.return_value = (
+            b'{"status": "success", "message": "stale", "id": 0}\n'
+            b'{"status": "success", "message": "pong", "id": 1}\n'
+        )
+        
+        with patch('socket.create_connection', return_value=mock_socket):
+            with BrowserClient() as client:
+                response = client.ping()
+        
+        assert response == {"status": "success", "message": "pong"}
+    
+    def test_keep_alive_resends_when_send_fails(self):
+        """Test a command that could not be written is resent on a new connection."""
+        closed_socket = MagicMock()
+        closed_socket.recv.return_value = b'{"status": "success", "message": "pong", "id": 1}\n'
+        closed_socket.sendall.side_effect = [None, BrokenPipeError()]
+        new_socket = MagicMock()
+        new_socket.recv.return_value = b'{"status": "success", "message": "pong", "id": 2}\n'
+        
+        with patch('socket.create_connection', side_effect=[closed_socket, new_socket]):
+            with BrowserClient() as client:
+                client.ping()
+                response = client.ping()
+        
+        assert response == {"status": "success", "message": "pong"}
+        closed_socket.close.assert_called_once()
+        new_socket.sendall.assert_called_once()
+    
+    def test_keep_alive_does_not_resend_after_close(self):
+        """Test a command already written is not resent if no response arrives."""
+        closed_socket = MagicMock()
+        closed_socket.recv.side_effect = [
+            b'{"status": "success", "message": "pong", "id": 1}\n',
+            b'',
+        ]
+        new_socket = MagicMock()
+        new_socket.recv.return_value = b'{"status": "success", "message": "pong", "id": 3}\n'
+        
+        with patch('socket.create_connection', side_effect=[closed_socket, new_socket]) as mock_connect:
+            with BrowserClient() as client:
+                client.ping()
+                response = client.click("#run")
+                assert mock_connect.call_count == 1
+                # The next command opens a fresh connection
+                assert client.ping() == {"status": "success", "message": "pong"}
+        
+        assert response["status"] == "error"
+        assert "before it responded" in response["message"]
+        assert closed_socket.sendall.call_count == 2
+        closed_socket.close.assert_called_once()
+        new_socket.sendall.assert_called_once()
+    
+    def test_keep_alive_connection_refused(self):
+        """Test keep-alive mode reports a server that is not running."""
+        with patch('socket.create_connection', side_effect=ConnectionRefusedError()):
+            with BrowserClient() as client:
+                response = client.ping()
+        
+        assert response["status"] == "error"
+        assert "Could not connect" in response["message"]
+    
     def test_goto_command(self):
         """Test goto command."""
         client = BrowserClient()
@@ -323,6 +428,25 @@ class TestBrowserClientMocked:
         assert command["selector"] == "button.submit"
         assert command["timeout"] == 3000
     
+    def test_click_first_of_command(self):
+        """Test click_first_of sends all candidate selectors in one command."""
+        client = BrowserClient()
+        
+        mock_socket = MagicMock()
+        mock_response = {"status": "success", "selector": "a.create"}
+        mock_socket.recv.return_value = json.dumps(mock_response).encode()
+        
+        with patch('socket.socket', return_value=mock_socket):
+            response = client.click_first_of(["button.create", "a.create"], timeout=2000)
+            
+        assert response["selector"] == "a.create"
+        
+        sent_data = mock_socket.sendall.call_args[0][0].decode()
+        command = json.loads(sent_data)
+        assert command["action"] == "click_first_of"
+        assert command["selectors"] == ["button.create", "a.create"]
+        assert command["timeout"] == 2000
+    
     def test_wait_command(self):
         """Test wait command."""
         client = BrowserClient()
@@ -401,6 +525,96 @@ class TestBrowserClientMocked:
         assert command["action"] == "eval_js"
         assert "document.querySelectorAll" in command["code"]
     
+    def test_eval_js_async_command(self):
+        """Test eval_js_async runs eval_js off the event loop."""
+        client = BrowserClient()
+        
+        with patch.object(client, 'eval_js', return_value={"status": "success", "result": 1}) as mock_eval:
+            response = asyncio.run(client.eval_js_async("() => 1"))
+            
+        assert response == {"status": "success", "result": 1}
+        mock_eval.assert_called_once_with("() => 1")
+    
+    def test_eval_js_batch_command(self):
+        """Test eval_js_batch sends all scripts in a single eval_js command."""
+        client = BrowserClient()
+        
+        mock_socket = MagicMock()
+        mock_response = {"status": "success", "result": {"title": "Example", "links": 3}}
+        mock_socket.recv.return_value = json.dumps(mock_response).encode()
+        
+        with patch('socket.socket', return_value=mock_socket):
+            response = client.eval_js_batch({
+                "title": "() => document.title",
+                "links": "() => document.links.length",
+            })
+            
+        assert response["result"] == {"title": "Example", "links": 3}
+        mock_socket.sendall.assert_called_once()
+        
+        sent_data = mock_socket.sendall.call_args[0][0].decode()
+        command = json.loads(sent_data)
+        assert command["action"] == "eval_js"
+        assert command["code"] == (
+            '() => Promise.all([(() => document.title)(), (() => document.links.length)()])'
+            '.then(r => ({"title": r[0], "links": r[1]}))'
+        )
+    
+    def test_install_library_sends_source_once(self):
+        """Test install_library only sends the library source on first use."""
+        client = BrowserClient()
+        
+        mock_socket = MagicMock()
+        mock_response = {"status": "success", "result": True}
+        mock_socket.recv.return_value = json.dumps(mock_response).encode()
+        
+        with patch('socket.socket', return_value=mock_socket):
+            first = client.install_library("__lib", "window.__lib = {};")
+            second = client.install_library("__lib", "window.__lib = {};")
+            
+        assert first["result"] is True
+        assert second == {"status": "success", "result": False}
+        mock_socket.sendall.assert_called_once()
+        
+        sent_data = mock_socket.sendall.call_args[0][0].decode()
+        command = json.loads(sent_data)
+        assert command["action"] == "eval_js"
+        assert 'if (window["__lib"]) return false;' in command["code"]
+        assert "window.__lib = {};" in command["code"]
+    
+    def test_install_library_force_and_failure(self):
+        """Test install_library retries after failure and honours force."""
+        client = BrowserClient()
+        
+        with patch.object(client, 'eval_js', return_value={"status": "error", "message": "boom"}) as mock_eval:
+            client.install_library("__lib", "window.__lib = {};")
+            client.install_library("__lib", "window.__lib = {};")
+        assert mock_eval.call_count == 2
+        
+        with patch.object(client, 'eval_js', return_value={"status": "success", "result": True}) as mock_eval:
+            client.install_library("__lib", "window.__lib = {};")
+            client.install_library("__lib", "window.__lib = {};", force=True)
+        assert mock_eval.call_count == 2
+    
+    def test_wait_for_js_command(self):
+        """Test wait_for_js races the script against a timeout in the browser."""
+        client = BrowserClient()
+        
+        mock_socket = MagicMock()
+        mock_response = {"status": "success", "result": None}
+        mock_socket.recv.return_value = json.dumps(mock_response).encode()
+        
+        with patch('socket.socket', return_value=mock_socket):
+            response = client.wait_for_js("() => new Promise(() => {})", timeout=1500)
+            
+        assert response["result"] is None
+        
+        sent_data = mock_socket.sendall.call_args[0][0].decode()
+        command = json.loads(sent_data)
+        assert command["action"] == "eval_js"
+        assert command["code"].startswith("() => Promise.race([(() => new Promise(() => {}))(), ")
+        assert "setTimeout(() => resolve(null), 1500)" in command["code"]
+    
     def test_download_command(self):
         """Test download command."""
         client = BrowserClient()
@@ -541,6 +755,49 @@ class TestBrowserServerMocked:
         assert response["status"] == "success"
         mock_page.click.assert_called_once_with("button.submit", timeout=5000)
     
+    def test_execute_command_click_first_of(self):
+        """Test _execute_command clicks the first candidate present on the page."""
+        server = BrowserServer()
+        
+        mock_controller = MagicMock()
+        mock_page = MagicMock()
+        mock_element = MagicMock()
+        mock_page.query_selector.side_effect = [None, mock_element]
+        mock_controller._page = mock_page
+        server.controller = mock_controller
+        
+        response = server._execute_command({
+            "action": "click_first_of",
+            "selectors": ["button.create", "a.create"],
+            "timeout": 2000
+        })
+        
+        assert response == {"status": "success", "selector": "a.create"}
+        mock_page.wait_for_selector.assert_called_once_with(
+            "button.create, a.create", timeout=2000
+        )
+        mock_element.click.assert_called_once_with(timeout=2000)
+    
+    def test_execute_command_click_first_of_timeout(self):
+        """Test _execute_command reports an error when no candidate appears."""
+        server = BrowserServer()
+        
+        mock_controller = MagicMock()
+        mock_page = MagicMock()
+        mock_page.wait_for_selector.side_effect = Exception("Timeout 2000ms exceeded")
+        mock_controller._page = mock_page
+        server.controller = mock_controller
+        
+        response = server._execute_command({
+            "action": "click_first_of",
+            "selectors": ["button.create"],
+            "timeout": 2000
+        })
+        
+        assert response["status"] == "error"
+        assert "Timeout" in response["message"]
+        mock_page.query_selector.assert_not_called()
+    
     def test_execute_command_wait(self):
         """Test _execute_command with wait action."""
         server = BrowserServer()
@@ -790,6 +1047,61 @@ class TestBrowserServerMocked:
         assert response["status"] == "success"
         mock_socket.close.assert_called_once()
     
+    def test_handle_client_keep_alive(self):
+        """Test _handle_client keeps keep-alive connections open."""
+        server = BrowserServer()
+        server.console = MagicMock()
+        server.controller = MagicMock()
+        
+        mock_socket = MagicMock()
+        command = {"action": "ping", "keep_alive": True, "id": 7}
+        mock_socket.recv.return_value = json.dumps(command).encode() + b"\n"
+        
+        server._handle_client(mock_socket)
+        
+        sent_data = mock_socket.sendall.call_args[0][0]
+        assert sent_data.endswith(b"\n")
+        response = json.loads(sent_data.decode())
+        assert response["status"] == "success"
+        assert response["id"] == 7
+        mock_socket.close.assert_not_called()
+        assert server._keep_alive == {mock_socket: b""}
+    
+    def test_handle_keep_alive_serves_complete_commands(self):
+        """Test _handle_keep_alive answers each full line and buffers the rest."""
+        server = BrowserServer()
+        server.console = MagicMock()
+        server.controller = MagicMock()
+        
+        mock_socket = MagicMock()
+        server._keep_alive[mock_socket] = b'{"action": "pi'
+        mock_socket.recv.return_value = (
+            b'ng", "keep_alive": true, "id": 1}\n'
+            b'{"action": "ping", "keep_alive": true, "id": 2}\n'
+            b'{"action"'
+        )
+        
+        server._handle_keep_alive(mock_socket)
+        
+        responses = [json.loads(c[0][0].decode()) for c in mock_socket.sendall.call_args_list]
+        assert [r["id"] for r in responses] == [1, 2]
+        assert server._keep_alive[mock_socket] == b'{"action"'
+        mock_socket.close.assert_not_called()
+    
+    def test_handle_keep_alive_client_closed(self):
+        """Test _handle_keep_alive drops connections the client closed."""
+        server = BrowserServer()
+        server.console = MagicMock()
+        
+        mock_socket = MagicMock()
+        mock_socket.recv.return_value = b""
+        server._keep_alive[mock_socket] = b""
+        
+        server._handle_keep_alive(mock_socket)
+        
+        mock_socket.close.assert_called_once()
+        assert server._keep_alive == {}
+    
     def test_handle_client_empty_data(self):
         """Test _handle_client with empty data."""
         server = BrowserServer()
@@ -893,6 +1205,26 @@ class TestBrowserServerMocked:
             
             # Input should not have been called
             mock_input.assert_not_called()
+            assert server.ready.is_set()
+    
+    def test_start_server_stopped_before_bind(self):
+        """Test stop() during startup keeps the server from binding its port."""
+        with patch('browser_agent.server.browser_server.PlaywrightBrowserController') as MockController, \
+             patch('browser_agent.server.browser_server.socket.socket') as MockSocket:
+            
+            mock_controller = MagicMock()
+            MockController.return_value = mock_controller
+            
+            server = BrowserServer()
+            # Stop arrives while the browser is still launching
+            mock_controller.start.side_effect = server.stop
+            
+            server.start(initial_url="https://example.com", wait_for_auth=False)
+            
+            MockSocket.assert_not_called()
+            mock_controller.stop.assert_called_once()
+            assert not server.running
+            assert not server.ready.is_set()
     
     def test_start_server_no_initial_url(self):
         """Test server start without initial URL."""
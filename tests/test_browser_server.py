@@ -15,6 +15,7 @@ class TestBrowserServer:
         assert server.browser_exe is None
         assert server.controller is None
         assert server.running is False
+        assert not server.ready.is_set()
 
     def test_browser_server_initialization_with_params(self):
         """Test BrowserServer can be initialized with custom parameters."""